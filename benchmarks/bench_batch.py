@@ -0,0 +1,46 @@
+"""Lockstep ``GameBatch`` versus one ``FinopolyEngine`` object graph per game.
+
+Run with ``python -m benchmarks.bench_batch``. Reports games per second and
+bytes of state per game for both representations on a single core.
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from finopoly.batch import GameBatch
+from finopoly.simulate import simulate
+from finopoly.engine import FinopolyEngine
+
+
+def engine_bytes_per_game(num_players=4, games=200):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = []
+    for _ in range(games):
+        game = FinopolyEngine()
+        for i in range(num_players):
+            game.add_player(f"Player {i+1}")
+        kept.append(game)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / games
+
+
+def main(batch_games=200_000, engine_games=5_000, num_players=4):
+    start = time.perf_counter()
+    simulate(engine_games, seed=0, workers=1, num_players=num_players)
+    engine_rate = engine_games / (time.perf_counter() - start)
+
+    batch = GameBatch(batch_games, num_players=num_players, rng=np.random.default_rng(0))
+    start = time.perf_counter()
+    batch.run()
+    batch_rate = batch_games / (time.perf_counter() - start)
+
+    print(f"engine objects  {engine_rate:12,.0f} games/s  {engine_bytes_per_game(num_players):8,.0f} bytes/game")
+    print(f"GameBatch       {batch_rate:12,.0f} games/s  {batch.nbytes_per_game():8,.0f} bytes/game")
+    print(f"speedup {batch_rate / engine_rate:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Strength and decision latency of ``MCTSPolicy``.
+
+Run with ``python -m benchmarks.bench_bots``. Seats one MCTS bot among
+``RandomPolicy`` opponents, rotating its seat, and reports its win rate
+next to a random seat's in the same games. Also reports time and playouts
+per decision for the default 200 ms budget.
+"""
+import time
+
+from finopoly.bots import MCTSPolicy
+from finopoly.engine import FinopolyEngine, RandomPolicy
+
+
+class TimedBot(MCTSPolicy):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.decisions = 0
+        self.searched = 0
+        self.seconds = 0.0
+        self.playouts = 0
+
+    def decide(self, game, player, kind):
+        start = time.perf_counter()
+        choice = super().decide(game, player, kind)
+        self.decisions += 1
+        if self.last_playouts:
+            self.searched += 1
+            self.seconds += time.perf_counter() - start
+            self.playouts += self.last_playouts
+        return choice
+
+
+def win_rate(games, num_players, policy_for_seat):
+    wins = 0
+    for g in range(games):
+        game = FinopolyEngine(seed=g, default_policy=RandomPolicy())
+        seat = g % num_players
+        players = [game.add_player(f"Player {i+1}", policy_for_seat(g) if i == seat else None) for i in range(num_players)]
+        results = game.play_game()
+        wins += bool(results) and results[0][0] is players[seat]
+    return wins / games
+
+
+def main(games=40, num_players=4, workers=None):
+    bot = TimedBot(workers=workers, seed=0)
+    bot_rate = win_rate(games, num_players, lambda g: bot)
+    random_rate = win_rate(games, num_players, lambda g: None)
+    print(f"MCTS seat win rate      {bot_rate:.2f}  (random seat {random_rate:.2f}, {games} games, {num_players} players)")
+    print(f"searched decisions      {bot.searched} of {bot.decisions}, {bot.workers} worker(s)")
+    print(f"time per decision       {bot.seconds / max(bot.searched, 1) * 1000:.0f} ms")
+    print(f"playouts per decision   {bot.playouts / max(bot.searched, 1):.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Cold-start cost of a new game with a shared versus a per-game catalog.
+
+Run with ``python -m benchmarks.bench_catalog``. "per-game catalog" builds a
+fresh ``GameCatalog`` for every game, which is what each session paid before
+the catalog was shared; "shared catalog" is what ``streamlit_app.py`` does.
+Both use the engine's default unseeded RNG, as a browser session does.
+"""
+import time
+import tracemalloc
+
+from finopoly.boards import load_catalog
+from finopoly.catalog import GameCatalog, shared_catalog
+from finopoly.engine import FinopolyEngine
+
+
+def construction_us(make, games):
+    make()
+    start = time.perf_counter()
+    for _ in range(games):
+        make()
+    return (time.perf_counter() - start) / games * 1e6
+
+
+def bytes_per_game(make, games):
+    make()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [make() for _ in range(games)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return used / games
+
+
+def main(games=5_000):
+    layouts = load_catalog()
+    cases = {
+        "per-game catalog": lambda: FinopolyEngine(catalog=GameCatalog()),
+        "shared catalog": lambda: FinopolyEngine(catalog=shared_catalog()),
+        "shared + layouts": lambda: FinopolyEngine(catalog=shared_catalog(), layouts=layouts),
+    }
+    for label, make in cases.items():
+        print(f"{label:18} {construction_us(make, games):8.1f} us/game  {bytes_per_game(make, games):8,.0f} bytes/game")
+
+
+if __name__ == "__main__":
+    main()
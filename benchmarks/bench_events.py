@@ -0,0 +1,56 @@
+"""Per-player event dispatch versus one ``EventTable`` pass over arrays.
+
+Run with ``python -m benchmarks.bench_events``. Applies a random event to
+each of ``players`` players, first one ``apply_effect`` call at a time on
+``Player`` objects, then with ``EventTable.apply_columns`` on arrays holding
+the same state, and checks the two agree.
+"""
+import random
+import time
+
+import numpy as np
+
+from finopoly.catalog import shared_catalog
+from finopoly.engine import Player, Project
+from finopoly.events import REVENUE, EventTable, apply_effect
+
+
+def main(players=100_000):
+    catalog = shared_catalog()
+    rng = random.Random(0)
+    names = [spec.name for spec in catalog.projects]
+    seats = []
+    for i in range(players):
+        player = Player(f"Player {i}")
+        for spec in rng.sample(catalog.projects, rng.randint(0, 3)):
+            player.add_project(Project(spec), 1)
+        seats.append(player)
+    events = np.array([rng.randrange(len(catalog.events)) for _ in range(players)])
+
+    owned = np.array([[name in {p.name for p in player.projects} for name in names] for player in seats])
+    revenue = np.array([player.total_cash_flow for player in seats], dtype=np.float64)
+    columns = {
+        "cash": np.array([player.cash for player in seats], dtype=np.float64),
+        "users": np.array([player.users for player in seats], dtype=np.float64),
+        "skip_next_turn": np.zeros(players, dtype=bool),
+    }
+    table = EventTable(catalog.events, names)
+
+    start = time.perf_counter()
+    for player, event in zip(seats, events):
+        apply_effect(catalog.events[event].impact, player)
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table.apply_columns(columns, np.arange(players), events, owned, {REVENUE: revenue})
+    vectorized = time.perf_counter() - start
+
+    for field, column in columns.items():
+        if not np.array_equal(column, [getattr(player, field) for player in seats]):
+            raise SystemExit(f"{field} differs between the executors")
+    print(f"apply_effect per player  {scalar / players * 1e9:8.0f} ns/player")
+    print(f"EventTable.apply_columns {vectorized / players * 1e9:8.0f} ns/player  ({scalar / vectorized:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Turn propagation through ``GameHub`` with many parked sessions.
+
+Run with ``python -m benchmarks.bench_hub``. Opens ``tables`` tables with
+``watchers`` threads parked in ``GameHub.wait`` on each, as waiting
+browsers are. It then ends turns at random tables and reports:
+
+* the time from ``publish`` to each watcher waking;
+* how many watchers woke with no new version for their table (should be
+  0);
+* the cost of taking a table lock from a script thread.
+"""
+import random
+import threading
+import time
+
+import numpy as np
+
+from finopoly.hub import GameHub
+
+
+class FakeGame:
+    def __init__(self, game_id):
+        self.game_id = game_id
+        self.version = 0
+
+
+def watch(hub, game_id, published, wakes, stray, stop):
+    seen = 0
+    while not stop.is_set():
+        version = hub.wait(game_id, seen, timeout=1.0)
+        now = time.perf_counter()
+        if version is None:
+            return
+        if version == seen:
+            continue # Timed out; parked again, as the app's rerun would
+        if version not in published[game_id]:
+            stray.append(game_id)
+        else:
+            wakes.append(now - published[game_id][version])
+        seen = version
+
+
+def main(tables=50, watchers=3, turns=500, seed=0):
+    hub = GameHub()
+    games = [FakeGame(f"table-{i}") for i in range(tables)]
+    for game in games:
+        hub.open(game)
+    published = {game.game_id: {} for game in games}
+    wakes, stray = [], []
+    stop = threading.Event()
+    threads = [threading.Thread(target=watch, args=(hub, game.game_id, published, wakes, stray, stop), daemon=True)
+               for game in games for _ in range(watchers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5) # Let every watcher park
+
+    rng = random.Random(seed)
+    lock_times = []
+    for _ in range(turns):
+        game = rng.choice(games)
+        start = time.perf_counter()
+        with hub.lock(game.game_id):
+            lock_times.append(time.perf_counter() - start)
+            game.version += 1
+            published[game.game_id][game.version] = time.perf_counter()
+        hub.publish(game.game_id, game.version)
+        time.sleep(0.002)
+
+    time.sleep(0.5)
+    stop.set()
+    for game in games:
+        hub.close(game.game_id)
+    for thread in threads:
+        thread.join()
+
+    wakes = np.array(wakes) * 1e3
+    print(f"{tables} tables x {watchers} watchers, {turns} turns")
+    print(f"wake latency        p50 {np.percentile(wakes, 50):.2f} ms  p99 {np.percentile(wakes, 99):.2f} ms  "
+          f"max {wakes.max():.2f} ms  ({len(wakes)} wakes, {turns * watchers} expected at most)")
+    print(f"stray wakes         {len(stray)}")
+    print(f"table lock          {np.median(lock_times) * 1e6:.0f} µs median")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Many tables in one process: rerun latency, memory per table, tables per core.
+
+Run with ``python -m benchmarks.bench_load``. For each session count N it
+opens N ``AppTest`` sessions of ``streamlit_app.py`` and steps them in
+turn, one rerun at a time. That matches a single-core server, which runs
+one rerun at a time however many tables are open. Each session sets up a
+3-player game, rolls, invests with probability ``--invest-rate`` and takes
+financing with probability ``--finance-rate``. When its game ends it starts
+a new one. Checkpoints go to a temporary database.
+
+Per N it reports:
+
+* rerun latency: p50 and p99 over every rerun, timed without tracing;
+* reruns per second;
+* memory per table, measured in a second, traced pass. "traced" is
+  ``tracemalloc`` growth divided by N: the game, its widgets and session
+  state, plus ``AppTest``'s own bookkeeping. "game" is the ``Finopoly``
+  object graph (players, projects, log, cached tables), with the shared
+  catalog, store and game hub left out.
+
+``AppTest`` adds its own work to each rerun, so the latencies are an upper
+bound for a real server. The last line estimates how many tables one core
+can host. Each table triggers a rerun every ``--think`` seconds, and the
+core is kept at ``--utilization``.
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+import numpy as np
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.CodeType)
+
+
+class Session:
+    """One browser tab driven through ``AppTest``, making random moves at the given rates."""
+
+    def __init__(self, seed, invest_rate, finance_rate):
+        self.rng = random.Random(seed)
+        self.invest_rate = invest_rate
+        self.finance_rate = finance_rate
+        self.latencies = []
+        self.actions = [] # Reruns still to make for the current move, as (object, method, arguments)
+        self.open()
+
+    def open(self):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(APP, default_timeout=60)
+        self.run()
+
+    def run(self):
+        start = time.perf_counter()
+        self.at.run()
+        self.latencies.append(time.perf_counter() - start)
+
+    def button(self, *labels):
+        return next((b for b in self.at.button if b.label.startswith(labels)), None)
+
+    def step(self):
+        """Make one rerun's worth of progress."""
+        at = self.at
+        game = at.session_state.game if "game" in at.session_state else None
+        if game is None or (not game.players and not game.game_over):
+            self.set_up()
+        elif game.game_over:
+            self.open() # A new tab for the next game
+            return
+        elif self.actions:
+            element, action, value = self.actions.pop(0)
+            getattr(element, action)(*value)
+        elif self.button("Roll Dice"):
+            self.button("Roll Dice").click()
+        elif self.button("Invest in"):
+            self.button("Invest in" if self.rng.random() < self.invest_rate else "Pass").click()
+        elif at.main.selectbox and at.main.selectbox[0].value == "Skip" and self.rng.random() < self.finance_rate:
+            self.finance()
+        elif self.button("Conduct IPO?"):
+            self.button("Conduct IPO?" if self.rng.random() < self.finance_rate else "No IPO").click()
+        else:
+            at.button[0].click()
+        self.run()
+
+    def set_up(self):
+        if not self.at.text_input:
+            return
+        self.at.number_input[0].set_value(3)
+        for i in range(3):
+            self.at.text_input[i].input(f"Player {i+1}")
+
+    def finance(self):
+        selectbox = self.at.main.selectbox[0]
+        option = self.rng.choice(selectbox.options[1:])
+        selectbox.set_value(option)
+        labels = {"Debt": "Take Debt", "VC Funding": "Get VC Funding", "Equity": "Raise Equity", "IPO": "Conduct IPO"}
+        self.actions.append((self, "press", (labels[option],)))
+
+    def press(self, label):
+        # Debt and Equity ask for an amount first; take the most on offer.
+        amount = self.at.number_input[0] if self.at.number_input else None
+        if amount is not None and amount.value != amount.max:
+            amount.set_value(amount.max)
+            self.actions.append((self, "press", (label,)))
+            return
+        button = self.button(label)
+        (button or self.at.button[0]).click()
+
+
+def graph_size(root, shared):
+    """Bytes in objects reachable from ``root``, not counting ``shared`` ids, types or modules."""
+    seen = set(shared)
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, SKIP_TYPES):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return total
+
+
+def reachable(*roots, stop=()):
+    """Ids of objects reachable from ``roots`` without passing through ``stop``."""
+    seen = {id(obj) for obj in stop}
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) not in seen and not isinstance(obj, SKIP_TYPES):
+            seen.add(id(obj))
+            stack.extend(gc.get_referents(obj))
+    return seen - {id(obj) for obj in stop}
+
+
+def drive(sessions, steps):
+    start = time.perf_counter()
+    for _ in range(steps):
+        for session in sessions:
+            session.step()
+    return time.perf_counter() - start
+
+
+def measure(n, steps, invest_rate, finance_rate, seed):
+    sessions = [Session(seed + i, invest_rate, finance_rate) for i in range(n)]
+    elapsed = drive(sessions, steps)
+    latencies = np.array([t for s in sessions for t in s.latencies[1:]]) # Skip each session's first run
+    reruns = sum(len(s.latencies) for s in sessions)
+    del sessions
+    gc.collect()
+
+    # A warm-up session first, so one-off allocations (lazy imports, caches)
+    # are not charged to the tables.
+    tracemalloc.start()
+    drive([Session(seed - 1, invest_rate, finance_rate)], steps)
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    traced_sessions = [Session(seed + i, invest_rate, finance_rate) for i in range(n)]
+    drive(traced_sessions, steps)
+    gc.collect()
+    traced = (tracemalloc.get_traced_memory()[0] - before) / n
+    tracemalloc.stop()
+
+    games = [s.at.session_state.game for s in traced_sessions if "game" in s.at.session_state]
+    # The catalog, store and hub (its loop, thread and table index) are shared
+    # by every session. The hub also holds each game, so the walk stops there.
+    shared = reachable(games[0].catalog, games[0].store, games[0].hub, stop=games) if games else set()
+    game_bytes = np.mean([graph_size(game, shared) for game in games]) if games else 0.0
+    return {
+        "p50": np.percentile(latencies, 50),
+        "p99": np.percentile(latencies, 99),
+        "mean": latencies.mean(),
+        "reruns_per_second": reruns / elapsed,
+        "traced": traced,
+        "game": game_bytes,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test many Finopoly tables in one process.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--steps", type=int, default=30, help="Reruns per session")
+    parser.add_argument("--invest-rate", type=float, default=0.5)
+    parser.add_argument("--finance-rate", type=float, default=0.3)
+    parser.add_argument("--think", type=float, default=5.0, help="Seconds between a player's clicks")
+    parser.add_argument("--utilization", type=float, default=0.7, help="Share of the core to plan for")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["FINOPOLY_DB"] = os.path.join(directory, "load.sqlite3")
+        print(f"{'sessions':>8}  {'p50':>8}  {'p99':>8}  {'reruns/s':>8}  {'traced/table':>12}  {'game/table':>10}")
+        for n in args.sessions:
+            r = measure(n, args.steps, args.invest_rate, args.finance_rate, args.seed)
+            print(f"{n:>8}  {r['p50'] * 1e3:>5.1f} ms  {r['p99'] * 1e3:>5.1f} ms  {r['reruns_per_second']:>8.1f}  "
+                  f"{r['traced'] / 1024:>8.0f} KiB  {r['game'] / 1024:>6.0f} KiB")
+
+    tables = args.utilization * args.think / r["mean"]
+    print(f"One core hosts about {tables:.0f} tables at a click every {args.think:g} s per table and "
+          f"{args.utilization:.0%} load (mean rerun {r['mean'] * 1e3:.1f} ms at {n} sessions), "
+          f"using {tables * r['traced'] / 2**20:.0f} MiB.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Exact Markov landing probabilities versus sampling ``move_player``.
+
+Run with ``python -m benchmarks.bench_markov``. Times a cold and a cached
+``landing_distribution`` for random layouts and checks it against a
+Monte Carlo estimate from the engine's own dice and movement.
+"""
+import random
+import time
+
+import numpy as np
+
+from finopoly.engine import FinopolyEngine
+from finopoly.markov import CRASH_PROBABILITY, landing_distribution, layout_of
+
+
+def sampled_landings(game, samples, rng):
+    player = game.add_player("Sampler")
+    counts = np.zeros((game.num_rounds, len(game.board)))
+    for _ in range(samples):
+        player.position = 0
+        skip = False
+        for r in range(game.num_rounds):
+            if skip:
+                skip = False
+                continue
+            tile = game.move_player(player, game.roll_dice())
+            counts[r, tile.position] += 1
+            skip = tile.tile_type == "Event" and rng.random() < CRASH_PROBABILITY
+    return counts / samples
+
+
+def main(layouts=200, samples=100_000):
+    rng = random.Random(0)
+    boards = [layout_of(FinopolyEngine(rng=random.Random(seed)).board) for seed in range(layouts)]
+
+    start = time.perf_counter()
+    for layout in boards:
+        landing_distribution(layout)
+    cold = (time.perf_counter() - start) / layouts
+
+    start = time.perf_counter()
+    for _ in range(100):
+        for layout in boards:
+            landing_distribution(layout)
+    warm = (time.perf_counter() - start) / (100 * layouts)
+
+    game = FinopolyEngine(rng=random.Random(1))
+    start = time.perf_counter()
+    sampled = sampled_landings(game, samples, rng)
+    sampling = time.perf_counter() - start
+    error = np.abs(sampled - landing_distribution(game.board).per_tile).max()
+
+    print(f"exact, cold    {cold * 1e6:10.1f} us/layout")
+    print(f"exact, cached  {warm * 1e6:10.2f} us/layout")
+    print(f"sampling       {sampling * 1e6:10.0f} us/layout ({samples} games, max |diff| {error:.4f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Checkpoint latency and restore time for many concurrent tables.
+
+Run with ``python -m benchmarks.bench_persistence``. Interleaves the turns
+of ``tables`` games, checkpointing each one after every turn as the app
+does, and reports how long ``save`` takes on the turn's thread, how the
+background writer batched the rows, and how long a restore (load plus
+replay) takes once everything is on disk.
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from finopoly.engine import FinopolyEngine, RandomPolicy
+from finopoly.persistence import GameStore
+from finopoly.replay import resume
+
+
+def main(tables=500, num_players=5):
+    with tempfile.TemporaryDirectory() as directory:
+        store = GameStore(os.path.join(directory, "bench.sqlite3"))
+        games = []
+        for i in range(tables):
+            game = FinopolyEngine(seed=i, default_policy=RandomPolicy())
+            for p in range(num_players):
+                game.add_player(f"Player {p+1}")
+            games.append(game)
+
+        save_times = []
+        start = time.perf_counter()
+        while any(not game.game_over for game in games):
+            for i, game in enumerate(games):
+                if game.game_over:
+                    continue
+                game.take_turn()
+                before = time.perf_counter()
+                store.save(str(i), game.log)
+                save_times.append(time.perf_counter() - before)
+        store.flush()
+        elapsed = time.perf_counter() - start
+
+        restore_times = []
+        for i in range(0, tables, max(1, tables // 100)):
+            before = time.perf_counter()
+            log = store.load(str(i))
+            game = FinopolyEngine(layouts=[log.positions])
+            for name in log.names:
+                game.add_player(name)
+            resume(game, log)
+            restore_times.append(time.perf_counter() - before)
+            if [p.cash for p in game.players] != [p.cash for p in games[i].players]:
+                raise SystemExit(f"Restored table {i} does not match")
+        store.close()
+
+    saves = np.array(save_times) * 1e6
+    restores = np.array(restore_times) * 1e3
+    print(f"{tables} tables, {len(saves)} checkpoints in {elapsed:.2f} s")
+    print(f"save()    p50 {np.percentile(saves, 50):6.1f} us   p99 {np.percentile(saves, 99):6.1f} us")
+    print(f"writer    {store.writes} rows in {store.batches} transactions")
+    print(f"restore   p50 {np.percentile(restores, 50):6.2f} ms   p99 {np.percentile(restores, 99):6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
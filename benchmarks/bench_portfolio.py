@@ -0,0 +1,58 @@
+"""Per-turn portfolio reads as a player's project count grows.
+
+Run with ``python -m benchmarks.bench_portfolio``. For portfolios of 3 to
+3000 projects, times one turn's worth of portfolio work (collect revenue,
+an Economic Downturn, an Expand and a standings NPV) against the running
+aggregates on ``Player``, and checks the aggregates against a full pass
+over ``player.projects``.
+"""
+import math
+import random
+import time
+
+from finopoly.catalog import shared_catalog
+from finopoly.engine import Player, Project
+from finopoly.events import apply_effect
+from finopoly.valuation import DEFAULT_RATE, annuity_factor
+
+ROUND = 4
+
+
+def portfolio(size, rng):
+    catalog = shared_catalog()
+    player = Player("Player")
+    for i in range(size):
+        player.add_project(Project(catalog.projects[i % len(catalog.projects)]), rng.randint(1, ROUND))
+    player.expire_projects(ROUND)
+    return player
+
+
+def full_pass(player):
+    revenue = sum(p.annual_cash_flow for p in player.projects)
+    npv = sum(p.annual_cash_flow * annuity_factor(DEFAULT_RATE, p.life - (ROUND - p.purchase_round)) for p in player.projects)
+    return revenue, npv * (1 - player.equity_dilution)
+
+
+def main(sizes=(3, 30, 300, 3000), repeats=2000):
+    catalog = shared_catalog()
+    downturn = next(event for event in catalog.events if event.name == "Economic Downturn")
+    rng = random.Random(0)
+    print(f"{'projects':>8}  {'per turn':>10}")
+    for size in sizes:
+        player = portfolio(size, rng)
+        projects = list(player.projects)
+        start = time.perf_counter()
+        for i in range(repeats):
+            player.collect_project_revenues()
+            apply_effect(downturn.impact, player)
+            player.adjust_project(projects[i % size], 1.0)
+            player.calculate_total_npv(ROUND)
+        elapsed = time.perf_counter() - start
+        revenue, npv = full_pass(player)
+        if not (math.isclose(player.total_cash_flow, revenue) and math.isclose(player.calculate_total_npv(ROUND), npv)):
+            raise SystemExit(f"Aggregates drifted from the projects at {size} projects")
+        print(f"{size:>8}  {elapsed / repeats * 1e6:7.2f} us")
+
+
+if __name__ == "__main__":
+    main()
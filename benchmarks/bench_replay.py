@@ -0,0 +1,53 @@
+"""Turn-log size and replay cost for 5-round, 5-player games.
+
+Run with ``python -m benchmarks.bench_replay``. Plays seeded games with
+``RandomPolicy``, checks that replaying each log reproduces the final
+scores, and times a full replay and random-access ``Replay.state_at``.
+"""
+import time
+
+from finopoly.engine import FinopolyEngine, RandomPolicy
+from finopoly.replay import Replay, replay
+from finopoly.turnlog import TurnLog
+
+
+def logged_game(seed, num_players=5):
+    game = FinopolyEngine(seed=seed, default_policy=RandomPolicy())
+    for i in range(num_players):
+        game.add_player(f"Player {i+1}")
+    game.play_game()
+    return game
+
+
+def main(games=500, repeats=2000):
+    sizes = []
+    for seed in range(games):
+        game = logged_game(seed)
+        raw = game.log.to_bytes()
+        sizes.append(len(raw))
+        replayed = replay(raw)
+        expected = [(p.name, score) for p, score, *_ in game.final_scores()]
+        if [(p.name, score) for p, score, *_ in replayed.final_scores()] != expected:
+            raise SystemExit(f"Replay of game {seed} does not match")
+
+    log = TurnLog.from_bytes(logged_game(0).log.to_bytes())
+    start = time.perf_counter()
+    for _ in range(repeats):
+        replay(log)
+    full = (time.perf_counter() - start) / repeats
+
+    history = Replay(log)
+    history.state_at()
+    turns = len(log) + 1
+    start = time.perf_counter()
+    for i in range(repeats):
+        history.state_at(i * 7 % turns)
+    seek = (time.perf_counter() - start) / repeats
+
+    print(f"log size      {sum(sizes) / games:8.1f} bytes/game (max {max(sizes)}, {games} games replayed exactly)")
+    print(f"full replay   {full * 1e6:8.1f} us/game ({len(log)} turns)")
+    print(f"state_at      {seek * 1e6:8.1f} us/turn (snapshot every {history.snapshot_every} turns)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Vectorized sensitivity grid versus looping over ``Project`` methods.
+
+Run with ``python -m benchmarks.bench_sensitivity``. Values the whole
+catalog on a rates x shocks x actions grid both ways. Exits non-zero if any
+cell drifts more than 1e-9 from the loop.
+"""
+import sys
+import time
+
+import numpy as np
+
+from finopoly.catalog import GameCatalog
+from finopoly.engine import Project
+from finopoly.sensitivity import ACTIONS, evaluate
+
+TOLERANCE = 1e-9
+
+
+def loop_grid(specs, rates, shocks):
+    out = np.empty((3, len(specs), len(rates), len(shocks), len(ACTIONS)))
+    for i, spec in enumerate(specs):
+        project = Project(spec)
+        for j, rate in enumerate(rates):
+            for k, shock in enumerate(shocks):
+                for a, (_, factor, extra_life, extra_cost) in enumerate(ACTIONS):
+                    project.annual_cash_flow = spec.annual_cash_flow * (1 + shock) * factor
+                    project.life = spec.life + extra_life
+                    outlay = project.cost + extra_cost
+                    present = project.calculate_npv(rate) + project.cost
+                    payback = outlay / project.annual_cash_flow if project.annual_cash_flow > 0 else np.inf
+                    out[:, i, j, k, a] = present - outlay, present / outlay, payback
+    return out
+
+
+def main(rate_steps=121, shock_steps=101):
+    specs = GameCatalog().projects
+    rates = np.linspace(0.0, 0.30, rate_steps)
+    shocks = np.linspace(-0.5, 0.5, shock_steps)
+
+    start = time.perf_counter()
+    expected = loop_grid(specs, rates, shocks)
+    loop_time = time.perf_counter() - start
+    start = time.perf_counter()
+    grid = evaluate(specs, rates, shocks)
+    fast_time = time.perf_counter() - start
+
+    values = np.stack([grid["npv"], grid["profitability_index"], grid["payback"]])
+    finite = np.isfinite(expected)
+    error = float(np.max(np.abs(values[finite] - expected[finite])))
+    same_infinities = bool(np.array_equal(np.isinf(values), np.isinf(expected)))
+    print(f"{grid['npv'].size} cells  loop {loop_time * 1e3:8.1f} ms  vectorized {fast_time * 1e3:6.2f} ms  "
+          f"{loop_time / fast_time:6.1f}x  max |err| {error:.2e}")
+    return 0 if error <= TOLERANCE and same_infinities else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Exact solve time, and the solved value against sampled games.
+
+Run with ``python -m benchmarks.bench_solver``. Solves a one-player game
+on a few boards and reports the states visited and seconds taken. It then
+plays games on the same board with ``SolverPolicy`` and checks that their
+mean score, with bankruptcies scored as 0, matches the solved value within
+its 99% confidence interval. The seeds are fixed, so a pass or failure
+repeats; at 99% three correct boards all pass about 97% of the time.
+"""
+import math
+import time
+
+from finopoly.engine import FinopolyEngine
+from finopoly.rng import RandomStream
+from finopoly.solver import SolverPolicy
+
+Z_99 = 2.576 # Two-sided 99% normal quantile
+
+
+def main(seeds=(0, 1, 2), games=5000):
+    print(f"{'board':>5}  {'states':>7}  {'solve':>7}  {'solved':>7}  {'sampled':>15}  {'games':>6}")
+    for seed in seeds:
+        game = FinopolyEngine(seed=seed)
+        player = game.add_player("Player 1")
+        policy = SolverPolicy()
+        solver = policy.solver_for(game)
+        start = time.perf_counter()
+        value = solver.value(solver.state_of(game, player))
+        elapsed = time.perf_counter() - start
+
+        total = squares = 0.0
+        for g in range(games):
+            played = FinopolyEngine(seed=seed)
+            played.rng = RandomStream(seed, stream=g + 1)
+            played.add_player("Player 1", policy)
+            results = played.play_game()
+            score = results[0][1] if results else 0.0
+            total += score
+            squares += score * score
+        mean = total / games
+        margin = Z_99 * math.sqrt(max(squares / games - mean * mean, 0) / games)
+        print(f"{seed:>5}  {len(solver.values):>7}  {elapsed:>6.2f}s  {value:>7.2f}  {mean:>7.2f} ± {margin:<5.2f}  {games:>6}")
+        if abs(mean - value) > margin:
+            raise SystemExit(f"Board {seed}: sampled mean is too far from the solved value")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Tournament throughput and memory as the number of games grows.
+
+Run with ``python -m benchmarks.bench_tournament``. Plays round-robin
+tournaments of increasing size in one process, with results streamed to a
+temporary directory. Reports games per second, bytes on disk per game and
+the traced peak allocation. The peak should not grow with the game count.
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from finopoly.tournament import read_results, run_tournament
+
+POLICIES = ["always-debt", "early-vc", "ipo-round-4", "low-risk", "score"]
+
+
+def main(sizes=(100, 400, 1600), workers=1):
+    print(f"{'games/pair':>10}  {'games':>7}  {'games/s':>8}  {'disk/game':>9}  {'peak':>9}")
+    for games in sizes:
+        with tempfile.TemporaryDirectory() as path:
+            out = os.path.join(path, "results")
+            tracemalloc.start()
+            start = time.perf_counter()
+            result = run_tournament(POLICIES, games, out, workers=workers)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            schema, columns = read_results(out)
+            if schema["rows"] != result.games * schema["num_players"]:
+                raise SystemExit("Row count on disk does not match the games played")
+            disk = sum(os.path.getsize(os.path.join(out, column["file"])) for column in schema["columns"])
+            print(f"{games:>10}  {result.games:>7}  {result.games / elapsed:>8.0f}  {disk / result.games:>7.0f} B  {peak / 1024:>6.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Closed-form valuation versus the original year-by-year discount loops.
+
+Run with ``python -m benchmarks.bench_valuation``. Exits non-zero if any
+result drifts more than 1e-9 from the loop or the batch speedup is below 50x.
+"""
+import sys
+import time
+
+import numpy as np
+
+from finopoly.valuation import npv, portfolio_npv, profitability_index
+
+TOLERANCE = 1e-9
+MIN_SPEEDUP = 50
+
+
+def loop_npv(cost, cash_flow, life, rate=0.10):
+    value = -cost
+    for year in range(1, life + 1):
+        value += cash_flow / ((1 + rate) ** year)
+    return value
+
+
+def loop_profitability_index(cost, cash_flow, life, rate=0.10):
+    present_value = 0
+    for year in range(1, life + 1):
+        present_value += cash_flow / ((1 + rate) ** year)
+    return present_value / cost
+
+
+def loop_total_npv(cash_flows, lives, purchase_rounds, current_round, dilution, ipo_done):
+    total = 0
+    for cash_flow, life, purchase_round in zip(cash_flows, lives, purchase_rounds):
+        remaining = life - (current_round - purchase_round)
+        for year in range(1, remaining + 1):
+            total += cash_flow / ((1 + 0.10) ** year)
+    total *= (1 - dilution)
+    if ipo_done:
+        total *= 0.7
+    return total
+
+
+def best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_projects(n=200_000, seed=0):
+    rng = np.random.default_rng(seed)
+    cost = rng.uniform(10, 60, n)
+    cash_flow = rng.uniform(5, 30, n)
+    life = rng.integers(1, 6, n)
+    rate = rng.uniform(0.0, 0.25, n)
+
+    rows = list(zip(cost.tolist(), cash_flow.tolist(), life.tolist(), rate.tolist()))
+    loop_time, loop_values = best_of(lambda: [(loop_npv(*r), loop_profitability_index(*r)) for r in rows])
+    fast_time, fast_values = best_of(lambda: (npv(cost, cash_flow, life, rate), profitability_index(cost, cash_flow, life, rate)))
+
+    expected = np.array(loop_values)
+    error = max(np.max(np.abs(fast_values[0] - expected[:, 0])), np.max(np.abs(fast_values[1] - expected[:, 1])))
+    return "project NPV + PI", n, loop_time, fast_time, error
+
+
+def bench_portfolios(games=20_000, players=5, projects=8, seed=1):
+    rng = np.random.default_rng(seed)
+    shape = (games, players, projects)
+    cash_flow = rng.uniform(5, 40, shape)
+    # Small integers, stored as int8 the way GameBatch keeps them.
+    life = rng.integers(2, 5, shape, dtype=np.int8)
+    purchase_round = rng.integers(1, 6, shape, dtype=np.int8)
+    owned = rng.random(shape) < 0.4
+    dilution = rng.choice([0.0, 0.1, 0.2, 0.3], (games, players))
+    ipo_done = rng.random((games, players)) < 0.2
+    current_round = np.full(games, 6)
+
+    def loop():
+        out = np.empty((games, players))
+        for g in range(games):
+            for p in range(players):
+                mask = owned[g, p]
+                out[g, p] = loop_total_npv(cash_flow[g, p][mask].tolist(), life[g, p][mask].tolist(),
+                                           purchase_round[g, p][mask].tolist(), int(current_round[g]),
+                                           float(dilution[g, p]), bool(ipo_done[g, p]))
+        return out
+
+    loop_time, expected = best_of(loop)
+    fast_time, values = best_of(lambda: portfolio_npv(cash_flow, life, purchase_round, current_round[:, None],
+                                                      owned, dilution, ipo_done))
+    return "portfolio NPV", games * players, loop_time, fast_time, float(np.max(np.abs(values - expected)))
+
+
+def main():
+    ok = True
+    for name, n, loop_time, fast_time, error in (bench_projects(), bench_portfolios()):
+        speedup = loop_time / fast_time
+        print(f"{name:18} n={n:>8}  loop {loop_time * 1e3:9.1f} ms  "
+              f"closed form {fast_time * 1e3:7.2f} ms  {speedup:7.1f}x  max |err| {error:.2e}")
+        ok = ok and error <= TOLERANCE and speedup >= MIN_SPEEDUP
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Timing suite for the paths a change is most likely to slow down.
+
+Run with ``python -m benchmarks.suite``. Each case reports the best time
+per call over a few repeats:
+
+* ``Project.calculate_npv`` and ``Player.calculate_total_npv``;
+* ``Finopoly.create_board`` and the ``show_scoreboard`` table;
+* one turn of ``play_turn`` through Streamlit's ``AppTest``, covering every
+  rerun from "Roll Dice" to the end of the turn;
+* a whole 5-round, 4-player headless game.
+
+``--save FILE`` writes the times as a JSON baseline. ``--compare FILE``
+times the cases again, prints the change against that baseline and exits
+non-zero if any case is slower by more than ``--threshold`` (default
+25%, which leaves room for a noisy machine). Save and compare on the same
+machine.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from finopoly.catalog import GameCatalog
+from finopoly.engine import FinopolyEngine, Player, Project, RandomPolicy
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+FORMAT_VERSION = 1
+THRESHOLD = 0.25
+
+
+def best_per_call(func, number, repeat=5):
+    """Fastest mean time of ``number`` calls to ``func``, over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+# --- Cases ---
+def project_npv():
+    project = Project(GameCatalog().projects[0])
+    return best_per_call(project.calculate_npv, 20_000)
+
+
+def player_total_npv():
+    player = Player("Player 1")
+    for i, spec in enumerate(GameCatalog().projects[:8]):
+        player.add_project(Project(spec), i % 4 + 1)
+    return best_per_call(lambda: player.calculate_total_npv(4), 20_000)
+
+
+def app_game(num_players=4):
+    # Imported here so the other cases run without Streamlit installed.
+    from streamlit_app import Finopoly
+
+    game = Finopoly(seed=0, catalog=GameCatalog())
+    for i in range(num_players):
+        game.add_player(f"Player {i+1}")
+    return game
+
+
+def create_board():
+    game = app_game()
+    return best_per_call(game.create_board, 5_000)
+
+
+def scoreboard():
+    game = app_game()
+    game.play_game()
+    return best_per_call(game.scoreboard_table, 500)
+
+
+def app_turn(turns=12, repeat=3):
+    from streamlit.testing.v1 import AppTest
+
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["FINOPOLY_DB"] = os.path.join(directory, "suite.sqlite3") # Keep the repo's own store untouched
+        for _ in range(repeat):
+            at = AppTest.from_file(APP, default_timeout=60).run()
+            at.number_input[0].set_value(3).run()
+            for i in range(3):
+                at.text_input[i].input(f"Player {i+1}").run()
+            game = at.session_state.game
+            start_turn = game.turn
+            start = time.perf_counter()
+            while game.turn - start_turn < turns and not game.game_over:
+                # The first button is always "Roll Dice" or the one that ends the turn.
+                at.button[0].click().run()
+            best = min(best, (time.perf_counter() - start) / (game.turn - start_turn))
+    return best
+
+
+def full_game(num_players=4):
+    games = iter(range(1_000_000))
+
+    def play():
+        game = FinopolyEngine(seed=next(games), default_policy=RandomPolicy())
+        for i in range(num_players):
+            game.add_player(f"Player {i+1}")
+        game.play_game()
+
+    return best_per_call(play, 100)
+
+
+CASES = {
+    "project_npv": project_npv,
+    "player_total_npv": player_total_npv,
+    "create_board": create_board,
+    "scoreboard": scoreboard,
+    "app_turn": app_turn,
+    "full_game": full_game,
+}
+
+
+# --- Baselines ---
+def run(names):
+    return {name: CASES[name]() for name in names}
+
+
+def environment():
+    return {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+            "processor": platform.processor(), "cpus": os.cpu_count()}
+
+
+def save(path, results):
+    with open(path, "w") as f:
+        json.dump({"format": FORMAT_VERSION, "environment": environment(), "seconds": results}, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        baseline = json.load(f)
+    if baseline.get("format") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a format {FORMAT_VERSION} benchmark baseline")
+    return baseline
+
+
+def compare(baseline, results, threshold=THRESHOLD):
+    """``(name, baseline seconds, seconds, change, regressed)`` for every case in both."""
+    rows = []
+    for name, seconds in results.items():
+        before = baseline["seconds"].get(name)
+        if before is None:
+            continue
+        change = seconds / before - 1
+        rows.append((name, before, seconds, change, change > threshold))
+    return rows
+
+
+def format_time(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} µs"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time Finopoly's hot paths and compare against a baseline.")
+    parser.add_argument("--only", nargs="+", choices=list(CASES), default=list(CASES), help="Cases to run")
+    parser.add_argument("--save", metavar="FILE", help="Write the times as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Compare the times with a saved baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    baseline = load(args.compare) if args.compare else None
+    results = run(args.only)
+    if args.save:
+        save(args.save, results)
+
+    if baseline is None:
+        print(f"{'case':<18}  {'time/call':>10}  {'calls/s':>10}")
+        for name, seconds in results.items():
+            print(f"{name:<18}  {format_time(seconds):>10}  {1 / seconds:>10.0f}")
+        return 0
+
+    if baseline["environment"] != environment():
+        print("Warning: the baseline was saved in a different environment.")
+    print(f"{'case':<18}  {'baseline':>10}  {'now':>10}  {'change':>8}")
+    regressions = 0
+    for name, before, seconds, change, regressed in compare(baseline, results, args.threshold):
+        regressions += regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<18}  {format_time(before):>10}  {format_time(seconds):>10}  {change:>+7.1%}{flag}")
+    if regressions:
+        print(f"{regressions} case(s) slower than the baseline by more than {args.threshold:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
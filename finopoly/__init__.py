@@ -0,0 +1,20 @@
+from .bots import MCTSPolicy
+from .catalog import GameCatalog, ProjectSpec, shared_catalog
+from .engine import (
+    Event,
+    FinancingOption,
+    FinopolyEngine,
+    GreedyPolicy,
+    Player,
+    Policy,
+    Project,
+    RandomPolicy,
+    Tile,
+)
+from .hub import GameHub
+from .replay import Replay, ReplayEngine, replay
+from .rng import RandomStream
+from .simulate import SimulationResult, simulate
+from .solver import Solver, SolverPolicy
+from .tournament import TournamentResult, run_tournament
+from .turnlog import TurnLog
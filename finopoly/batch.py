@@ -0,0 +1,340 @@
+"""Struct-of-arrays Finopoly state for many games played in lockstep.
+
+``GameBatch`` keeps N games in NumPy arrays (one row per game) instead of
+``Player``/``Project``/``Tile`` objects, so the catalog is never copied and a
+seat's turn is one vectorized step across every game. The rules mirror
+``FinopolyEngine``; decisions come from a ``BatchPolicy``, which answers for
+all games at once.
+"""
+import numpy as np
+
+from .catalog import shared_catalog
+from .events import REVENUE, EventTable
+from .rng import RandomStream
+from .valuation import DEFAULT_RATE, annuity_factor, portfolio_npv
+
+# Tile codes. The engine's two Special tiles get their own codes here.
+INVESTMENT, FINANCING, EVENT, NEUTRAL, IPO, STRATEGY = range(6)
+TILE_NAMES = ["Investment", "Financing", "Event", "Neutral", "IPO", "Strategy"]
+# Tile code for each slot of a shuffled position list, as in create_board.
+SLOT_TILES = np.array([INVESTMENT] * 8 + [FINANCING] * 2 + [EVENT] * 4 + [NEUTRAL] * 4 + [IPO, STRATEGY], dtype=np.int8)
+BOARD_SIZE = SLOT_TILES.size
+
+# Financing choices.
+NO_FINANCING, DEBT, VC, EQUITY, IPO_FINANCING = range(5)
+# Strategy actions.
+SKIP, EXPAND, PIVOT, SELL = range(4)
+
+NO_OWNER = -1
+
+
+def _flat(array, rows, cols):
+    """``array[rows, cols]`` for a C-contiguous 2-D array, via one flat gather."""
+    return array.reshape(-1)[rows * array.shape[1] + cols]
+
+
+class Catalog:
+    """Project and event data as arrays, shared read-only by every game.
+
+    ``source`` is a ``GameCatalog`` or an engine; by default the process-wide
+    catalog.
+    """
+
+    def __init__(self, source=None):
+        source = source if source is not None else shared_catalog()
+        projects = source.projects
+        self.project_names = [p.name for p in projects]
+        self.cost = np.array([p.cost for p in projects], dtype=np.float64)
+        self.cash_flow = np.array([p.annual_cash_flow for p in projects], dtype=np.float64)
+        self.life = np.array([p.life for p in projects], dtype=np.int8)
+        self.user_gain = np.array([p.user_gain for p in projects], dtype=np.float64)
+        self.event_names = [e.name for e in source.events]
+        self.event_table = EventTable(source.events, self.project_names)
+        self.financing_max = {o.name: o.max_amount for o in source.financing_options}
+
+    def project_index(self, name):
+        return self.project_names.index(name)
+
+
+class BatchPolicy:
+    """Vectorized decision callbacks. The base class always passes.
+
+    Every method receives the batch, the indices of the games that need a
+    decision and the seat to move, and returns one answer per game.
+    """
+
+    def invest(self, batch, games, seat, project):
+        return np.zeros(games.size, dtype=bool)
+
+    def financing(self, batch, games, seat):
+        """Return ``(choice, amount)`` arrays; ``choice`` is a financing code."""
+        return np.full(games.size, NO_FINANCING, dtype=np.int8), np.zeros(games.size)
+
+    def ipo(self, batch, games, seat):
+        return np.zeros(games.size, dtype=bool)
+
+    def strategy(self, batch, games, seat):
+        """Return ``(project, action)`` arrays; only owned projects are acted on."""
+        return np.zeros(games.size, dtype=np.int8), np.full(games.size, SKIP, dtype=np.int8)
+
+
+class RandomBatchPolicy(BatchPolicy):
+    """Vectorized counterpart of ``RandomPolicy``."""
+
+    def invest(self, batch, games, seat, project):
+        return batch.rng.random(games.size) < 0.5
+
+    def financing(self, batch, games, seat):
+        vc_open = ~batch.vc_used[seat][games]
+        ipo_open = np.full(games.size, batch.current_round >= 4)
+        options = np.stack([np.ones(games.size, dtype=bool), np.ones(games.size, dtype=bool),
+                            vc_open, np.ones(games.size, dtype=bool), ipo_open], axis=1)
+        # Pick uniformly among Skip and the options available in each game.
+        weights = batch.rng.random(options.shape) * options
+        choice = weights.argmax(axis=1).astype(np.int8)
+        amount = np.zeros(games.size)
+        debt = choice == DEBT
+        equity = choice == EQUITY
+        amount[debt] = batch.rng.integers(1, batch.catalog.financing_max["Debt"] + 1, debt.sum())
+        amount[equity] = batch.rng.integers(1, batch.catalog.financing_max["Equity"] + 1, equity.sum())
+        return choice, amount
+
+    def ipo(self, batch, games, seat):
+        return batch.rng.random(games.size) < 0.5
+
+    def strategy(self, batch, games, seat):
+        owned = batch.owner[games] == seat
+        weights = batch.rng.random(owned.shape) * owned
+        project = weights.argmax(axis=1).astype(np.int8)
+        action = batch.rng.integers(0, 4, games.size).astype(np.int8)
+        return project, action
+
+
+class GreedyBatchPolicy(BatchPolicy):
+    """Vectorized counterpart of ``GreedyPolicy``."""
+
+    def invest(self, batch, games, seat, project):
+        catalog = batch.catalog
+        value = batch.cash_flow[games, project] * batch.annuity[batch.life[games, project]]
+        return value > catalog.cost[project]
+
+
+class GameBatch:
+    """``n_games`` games of ``num_players`` seats, advanced one seat at a time."""
+
+    def __init__(self, n_games, num_players=4, rng=None, catalog=None, policies=None, num_rounds=5):
+        self.n_games = n_games
+        self.num_players = num_players
+        self.num_rounds = num_rounds
+        # A NumPy Generator, or a RandomStream whose generator the batch draws arrays from.
+        rng = rng if rng is not None else RandomStream()
+        self.rng = rng.generator if isinstance(rng, RandomStream) else rng
+        self.catalog = catalog if catalog is not None else Catalog()
+        if policies is None:
+            policies = [RandomBatchPolicy() for _ in range(num_players)]
+        self.policies = list(policies)
+        self.current_round = 1
+        self.current_seat = 0
+        self.game_over = False
+
+        # Per-seat arrays are seat-major, (num_players, n_games), so one
+        # seat's column across every game is contiguous.
+        shape = (num_players, n_games)
+        self.cash = np.full(shape, 100.0)
+        self.users = np.ones(shape)
+        self.debt = np.zeros(shape)
+        self.position = np.zeros(shape, dtype=np.int8)
+        # Equity dilution in tenths: VC adds 1, an equity raise adds 2.
+        self.dilution = np.zeros(shape, dtype=np.uint8)
+        self.vc_used = np.zeros(shape, dtype=bool)
+        self.ipo_done = np.zeros(shape, dtype=bool)
+        self.skip_next = np.zeros(shape, dtype=bool)
+        self.active = np.ones(shape, dtype=bool)
+        # Running total of each seat's owned annual cash flow.
+        self.revenue = np.zeros(shape)
+
+        k = self.catalog.cost.size
+        self.owner = np.full((n_games, k), NO_OWNER, dtype=np.int8)
+        self.purchase_round = np.zeros((n_games, k), dtype=np.int8)
+        self.cash_flow = np.tile(self.catalog.cash_flow, (n_games, 1))
+        self.life = np.tile(self.catalog.life, (n_games, 1))
+
+        self.tile, self.tile_project = self.shuffle_boards(n_games)
+        self.annuity = np.array([annuity_factor(DEFAULT_RATE, n) for n in range(16)])
+
+    def shuffle_boards(self, n_games):
+        """One independent ``create_board`` shuffle per game."""
+        positions = np.argsort(self.rng.random((n_games, BOARD_SIZE)), axis=1)
+        rows = np.arange(n_games)[:, None]
+        tile = np.empty((n_games, BOARD_SIZE), dtype=np.int8)
+        tile[rows, positions] = SLOT_TILES
+        tile_project = np.full((n_games, BOARD_SIZE), -1, dtype=np.int8)
+        investments = np.flatnonzero(SLOT_TILES == INVESTMENT)
+        tile_project[rows, positions[:, investments]] = investments % self.catalog.cost.size
+        return tile, tile_project
+
+    def nbytes_per_game(self):
+        arrays = [self.cash, self.users, self.debt, self.position, self.dilution, self.vc_used,
+                  self.ipo_done, self.skip_next, self.active, self.revenue, self.owner, self.purchase_round,
+                  self.cash_flow, self.life, self.tile, self.tile_project]
+        return sum(a.nbytes for a in arrays) / self.n_games
+
+    # --- Vectorized turn ---
+    def step(self):
+        """Play the current seat's turn in every game, then move to the next seat."""
+        seat = self.current_seat
+        skipped = self.skip_next[seat] & self.active[seat]
+        self.skip_next[seat][skipped] = False
+        moving = np.flatnonzero(self.active[seat] & ~skipped)
+
+        roll = self.rng.integers(1, 7, moving.size, dtype=np.int8)
+        position = (self.position[seat][moving] + roll) % BOARD_SIZE
+        self.position[seat][moving] = position
+        tile = _flat(self.tile, moving, position)
+
+        # Group the games by the tile they landed on with one stable sort.
+        order = np.argsort(tile, kind="stable")
+        bounds = np.cumsum(np.bincount(tile, minlength=len(TILE_NAMES)))[:-1]
+        groups = np.split(order, bounds)
+        landed = [moving[group] for group in groups]
+
+        policy = self.policies[seat]
+        self._investment(policy, landed[INVESTMENT], position[groups[INVESTMENT]], seat)
+        self._financing(policy, landed[FINANCING], seat)
+        self._events(landed[EVENT], seat)
+        self.collect_revenue(landed[NEUTRAL], seat)
+        self._ipo(policy, landed[IPO], seat)
+        self._strategy(policy, landed[STRATEGY], seat)
+
+        self.current_seat += 1
+        if self.current_seat == self.num_players:
+            self.current_seat = 0
+            self.end_round()
+
+    def _investment(self, policy, games, position, seat):
+        project = _flat(self.tile_project, games, position)
+        cost = self.catalog.cost[project]
+        open_ = (_flat(self.owner, games, project) == NO_OWNER) & (self.cash[seat][games] >= cost)
+        games, project, cost = games[open_], project[open_], cost[open_]
+        buy = policy.invest(self, games, seat, project)
+        games, project, cost = games[buy], project[buy], cost[buy]
+        cell = games * self.owner.shape[1] + project
+        self.cash[seat][games] -= cost
+        self.owner.reshape(-1)[cell] = seat
+        self.purchase_round.reshape(-1)[cell] = self.current_round
+        self.users[seat][games] += self.catalog.user_gain[project]
+        self.revenue[seat][games] += self.cash_flow.reshape(-1)[cell]
+
+    def _financing(self, policy, games, seat):
+        if not games.size:
+            return
+        choice, amount = policy.financing(self, games, seat)
+        max_amount = self.catalog.financing_max
+        amount = np.where(choice == VC, max_amount["VC Funding"], amount)
+        amount = np.where(choice == IPO_FINANCING, max_amount["IPO"], amount)
+        amount = np.minimum(amount, np.select([choice == DEBT, choice == EQUITY], [max_amount["Debt"], max_amount["Equity"]], np.inf))
+        allowed = (choice != NO_FINANCING) & (amount > 0)
+        allowed &= ~((choice == VC) & self.vc_used[seat][games])
+        allowed &= ~((choice == IPO_FINANCING) & (self.current_round < 4))
+        games, choice, amount = games[allowed], choice[allowed], amount[allowed]
+
+        self.cash[seat][games] += amount
+        debt = choice == DEBT
+        self.debt[seat][games[debt]] += amount[debt]
+        vc = games[choice == VC]
+        self.vc_used[seat][vc] = True
+        self.dilution[seat][vc] += 1
+        self.dilution[seat][games[choice == EQUITY]] += 2
+        self.ipo_done[seat][games[choice == IPO_FINANCING]] = True
+
+    def _events(self, games, seat):
+        event = self.rng.integers(0, len(self.catalog.event_names), games.size)
+        self.apply_events(games, seat, event)
+
+    def apply_events(self, games, seat, event):
+        """Apply event ``event[i]`` (an index into the catalog) to game ``games[i]``."""
+        # No column for next_project_discount: no batch rule reads it yet.
+        columns = {"cash": self.cash[seat], "users": self.users[seat], "skip_next_turn": self.skip_next[seat]}
+        owned = self.owner[games] == seat
+        self.catalog.event_table.apply_columns(columns, games, event, owned, {REVENUE: self.revenue[seat][games]})
+
+    def collect_revenue(self, games, seat):
+        self.cash[seat][games] += self.revenue[seat][games]
+
+    def _ipo(self, policy, games, seat):
+        if self.current_round < 4:
+            return
+        games = games[~self.ipo_done[seat][games]]
+        games = games[policy.ipo(self, games, seat)]
+        self.cash[seat][games] += 100
+        self.ipo_done[seat][games] = True
+
+    def _strategy(self, policy, games, seat):
+        games = games[(self.owner[games] == seat).any(axis=1)]
+        if not games.size:
+            return
+        project, action = policy.strategy(self, games, seat)
+        valid = self.owner[games, project] == seat
+        games, project, action = games[valid], project[valid], action[valid]
+
+        expand = (action == EXPAND) & (self.cash[seat][games] >= 20)
+        g, p = games[expand], project[expand]
+        self.cash[seat][g] -= 20
+        self.revenue[seat][g] += self.cash_flow[g, p] * 0.5
+        self.cash_flow[g, p] *= 1.5
+
+        pivot = (action == PIVOT) & (self.cash[seat][games] >= 15)
+        g, p = games[pivot], project[pivot]
+        self.cash[seat][g] -= 15
+        self.revenue[seat][g] += self.cash_flow[g, p] * 0.2
+        self.cash_flow[g, p] *= 1.2
+        self.life[g, p] += 1
+
+        sell = action == SELL
+        g, p = games[sell], project[sell]
+        self.cash[seat][g] += self.catalog.cost[p] * 0.5
+        self.revenue[seat][g] -= self.cash_flow[g, p]
+        self.owner[g, p] = NO_OWNER
+
+    def end_round(self):
+        """Charge debt interest everywhere, bankrupting seats that cannot pay."""
+        interest = self.debt * 0.06
+        indebted = self.active & (self.debt > 0)
+        paying = indebted & (self.cash >= interest)
+        self.cash -= np.where(paying, interest, 0)
+        self.active &= ~(indebted & ~paying)
+        # A bankrupt seat's projects stay owned, as with a removed Player.
+        self.current_round += 1
+        if self.current_round > self.num_rounds:
+            self.game_over = True
+
+    def run(self):
+        while not self.game_over:
+            self.step()
+        return self.final_scores()
+
+    # --- Scoring ---
+    def total_npv(self):
+        seats = np.arange(self.num_players, dtype=np.int8)
+        owned = self.owner[:, None, :] == seats[None, :, None]
+        return portfolio_npv(
+            self.cash_flow[:, None, :],
+            self.life[:, None, :],
+            self.purchase_round[:, None, :],
+            np.full((self.n_games, 1), self.current_round),
+            owned,
+            self.dilution.T / 10.0,
+            self.ipo_done.T,
+        )
+
+    def final_scores(self):
+        """``end_game`` totals as an ``(n_games, num_players)`` array; NaN if bankrupt."""
+        seats = np.arange(self.num_players, dtype=np.int8)
+        projects = (self.owner[:, None, :] == seats[None, :, None]).sum(axis=2)
+        strategic = (self.ipo_done.T * 10 + projects * 2) * 0.2
+        total = self.total_npv() * 0.4 + self.users.T * 0.3 + self.cash.T * 0.1 + strategic
+        return np.where(self.active.T, total, np.nan)
+
+    def winners(self, scores=None):
+        scores = self.final_scores() if scores is None else scores
+        return np.where(np.isnan(scores), -np.inf, scores).argmax(axis=1)
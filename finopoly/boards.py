@@ -0,0 +1,179 @@
+"""Search for balanced board layouts and keep them in a seedable catalog.
+
+A layout is the list of 20 positions ``create_board`` would otherwise get
+from ``rng.shuffle``: the first eight hold the projects in catalog order,
+then two Financing, four Event and four Neutral tiles, then IPO and Strategy.
+Candidates are scored exactly with the Markov chain in ``finopoly.markov``:
+
+* seat access: expected number of projects each seat lands on before any
+  other seat does (seats move in turn order, independently of each other);
+* first-player advantage: seat 0's access minus the mean of the others;
+* IPO reachability: chance of landing on the IPO tile in rounds 4-5;
+* early expensive access: the worst chance, over projects costing $40M or
+  more, of having landed on that project's tile by the end of round 3.
+
+Lower ``score`` is more balanced. Run ``python -m finopoly.boards`` to search
+and write ``board_catalog.json``, which ``streamlit_app.py`` loads at startup.
+"""
+import argparse
+import heapq
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .catalog import shared_catalog
+from .markov import CRASH_PROBABILITY, move_matrix, reach_from, turn_powers
+
+BOARD_SIZE = 20
+SLOT_LABELS = ("Investment",) * 8 + ("Financing",) * 2 + ("Event",) * 4 + ("Neutral",) * 4 + ("IPO", "Strategy")
+IPO_SLOT = SLOT_LABELS.index("IPO")
+EXPENSIVE_COST = 40
+EARLY_ROUNDS = 3
+LATE_IPO_ROUND = 4
+DEFAULT_CATALOG = "board_catalog.json"
+CHUNK_SIZE = 1000 # Candidates per seeded RNG; part of what a catalog's seed reproduces
+
+
+def layout_labels(positions):
+    """Tile label at each board position for a ``create_board`` position list."""
+    labels = [None] * BOARD_SIZE
+    for slot, position in enumerate(positions):
+        labels[position] = SLOT_LABELS[slot]
+    return tuple(labels)
+
+
+def first_landing(labels, num_rounds=5, crash_probability=CRASH_PROBABILITY):
+    """``f[r, q]``: probability a seat first lands on tile ``q`` in round ``r + 1``."""
+    size = len(labels)
+    move = move_matrix(size)
+    crash = np.array([crash_probability if label == "Event" else 0.0 for label in labels])
+    # One copy of the chain per target tile, each one absorbing at its target.
+    targets = np.arange(size)
+    state = np.zeros((size, 2 * size))
+    state[:, 0] = 1.0
+    first = np.empty((num_rounds, size))
+    for r in range(num_rounds):
+        moving = state[:, :size] @ move
+        first[r] = moving[targets, targets]
+        moving[targets, targets] = 0.0
+        state = np.concatenate([moving * (1 - crash) + state[:, size:], moving * crash], axis=1)
+    return first
+
+
+def score_layout(positions, num_players=4, num_rounds=5):
+    """Fairness metrics and overall score for one position list."""
+    labels = layout_labels(positions)
+    first = first_landing(labels, num_rounds)
+    reached = np.cumsum(first, axis=0)
+    missed_through = 1 - reached
+    missed_before = np.vstack([np.ones((1, BOARD_SIZE)), missed_through[:-1]])
+
+    # Seat s gets to a project first in round r if it lands there in round r,
+    # the seats before it have not landed there through round r and the seats
+    # after it have not landed there before round r.
+    tiles = list(positions[:8])
+    seats = np.arange(num_players)[:, None, None]
+    access = (first[None, :, tiles]
+              * missed_through[None, :, tiles] ** seats
+              * missed_before[None, :, tiles] ** (num_players - 1 - seats)).sum(axis=(1, 2))
+
+    # Each candidate is scored once, so skip markov's per-layout caches.
+    ipo_reach = reach_from(turn_powers(labels, num_rounds), labels, positions[IPO_SLOT], LATE_IPO_ROUND)
+    costs = [spec.cost for spec in shared_catalog().projects]
+    expensive = [positions[i] for i in range(8) if costs[i % len(costs)] >= EXPENSIVE_COST]
+    early_expensive = min((reached[EARLY_ROUNDS - 1, tile] for tile in expensive), default=1.0)
+
+    advantage = access[0] - access[1:].mean()
+    score = (access.max() - access.min()) + abs(advantage) + (1 - ipo_reach) + (1 - early_expensive)
+    return {
+        "score": float(score),
+        "seat_access": [round(float(a), 6) for a in access],
+        "first_player_advantage": float(advantage),
+        "ipo_reachability": float(ipo_reach),
+        "early_expensive_access": float(early_expensive),
+    }
+
+
+def _search_chunk(seed, chunk, candidates, top_k, num_players, num_rounds):
+    rng = random.Random(f"{seed}:{chunk}")
+    best = []
+    for i in range(candidates):
+        positions = list(range(BOARD_SIZE))
+        rng.shuffle(positions)
+        metrics = score_layout(positions, num_players, num_rounds)
+        # Max-heap on score via negation; ties broken by draw order.
+        entry = (-metrics["score"], -chunk, -i, positions, metrics)
+        if len(best) < top_k:
+            heapq.heappush(best, entry)
+        elif entry > best[0]:
+            heapq.heapreplace(best, entry)
+    return best
+
+
+def search(n_candidates, seed=0, workers=None, top_k=50, num_players=4, num_rounds=5, chunk_size=CHUNK_SIZE):
+    """Score ``n_candidates`` random layouts and return the ``top_k`` most balanced.
+
+    Candidates are drawn in chunks, each from its own seeded RNG, so the
+    result depends only on ``seed`` and ``chunk_size``, not on ``workers``.
+    Returns a list of ``{"positions": [...], **metrics}`` sorted by score.
+    """
+    workers = workers or os.cpu_count() or 1
+    sizes = [min(chunk_size, n_candidates - start) for start in range(0, n_candidates, chunk_size)]
+    args = [(seed, chunk, size, top_k, num_players, num_rounds) for chunk, size in enumerate(sizes)]
+    if workers <= 1:
+        chunks = [_search_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_search_chunk, *zip(*args)))
+    merged = heapq.nlargest(top_k, (entry for chunk in chunks for entry in chunk))
+    return [dict(positions=positions, **metrics) for _, _, _, positions, metrics in merged]
+
+
+def save_catalog(layouts, path=DEFAULT_CATALOG, **params):
+    """Write layouts and the search parameters that produced them as JSON."""
+    lines = ",\n  ".join(json.dumps(layout) for layout in layouts)
+    with open(path, "w") as f:
+        f.write(f'{{"params": {json.dumps(params)},\n "layouts": [\n  {lines}\n ]}}\n')
+
+
+def load_catalog(path=DEFAULT_CATALOG):
+    """Position lists from a saved catalog, best first, for ``FinopolyEngine(layouts=...)``."""
+    with open(path) as f:
+        data = json.load(f)
+    layouts = [tuple(entry["positions"]) for entry in data["layouts"]]
+    for positions in layouts:
+        if sorted(positions) != list(range(BOARD_SIZE)):
+            raise ValueError(f"Invalid board layout in {path}: {positions}")
+    return layouts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search for balanced Finopoly board layouts.")
+    parser.add_argument("candidates", type=int, nargs="?", default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=50)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--out", default=DEFAULT_CATALOG)
+    args = parser.parse_args(argv)
+
+    layouts = search(args.candidates, seed=args.seed, workers=args.workers, top_k=args.top,
+                     num_players=args.players, chunk_size=args.chunk_size)
+    save_catalog(layouts, args.out, candidates=args.candidates, seed=args.seed, num_players=args.players,
+                 chunk_size=args.chunk_size)
+    baseline = score_layout(list(range(BOARD_SIZE)), args.players)
+    print(f"Kept {len(layouts)} of {args.candidates} layouts in {args.out}")
+    for label, metrics in (("best", layouts[0]), ("worst kept", layouts[-1])):
+        print(f"{label:>10}: score {metrics['score']:.3f}  "
+              f"seat access {', '.join(f'{a:.2f}' for a in metrics['seat_access'])}  "
+              f"IPO r{LATE_IPO_ROUND}+ {metrics['ipo_reachability']:.2f}  "
+              f"early expensive {metrics['early_expensive_access']:.2f}")
+    print(f"  unshuffled: score {baseline['score']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""Computer players that choose moves by Monte Carlo tree search.
+
+``MCTSPolicy`` is a ``Policy``. At each decision with more than one legal
+move it takes a plain-tuple ``snapshot`` of the game and searches from it
+until its time budget runs out. Each iteration does four things:
+
+* ``restore``s the snapshot into a reusable clone engine;
+* re-enters the pending tile, walking down the tree by UCB1 over the bot's
+  own decisions, and adds one new node per iteration;
+* plays the rest of the game out with the rollout policy for every seat;
+* backs up the bot's result: 1 for a win, 0 for bankruptcy, otherwise the
+  fraction of opponents it finished ahead of.
+
+Dice, events and opponents are sampled afresh every iteration, so a node
+stands for a sequence of the bot's choices rather than a single state
+(open-loop search). Children are keyed by decision kind and action.
+
+With ``workers`` above one the search is root-parallel. Every worker on a
+shared process pool grows its own tree from the same snapshot until a
+common deadline, and the root visit counts are summed. The move with the
+most visits is played.
+"""
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .catalog import shared_catalog
+from .engine import EXPAND_COST, PIVOT_COST, FinopolyEngine, Policy, RandomPolicy
+from .replay import restore, snapshot
+from .rng import RandomStream
+from .turnlog import FINANCE, INVEST, IPO, STRATEGY
+
+BUDGET = 0.2 # Seconds of search per decision
+EXPLORATION = math.sqrt(2)
+AMOUNT_STEPS = (0.25, 0.5, 1.0) # Fractions of the maximum tried for Debt and Equity
+
+_pools = {}
+
+
+def worker_pool(workers):
+    """The calling process's pool of ``workers`` search processes, created on first use."""
+    key = (os.getpid(), workers)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = ProcessPoolExecutor(max_workers=workers)
+    return pool
+
+
+# --- Moves ---
+def legal_actions(game, player, kind):
+    """The moves the search tries at a decision, as picklable plain values."""
+    if kind in (INVEST, IPO):
+        return [False, True]
+    actions = [None]
+    if kind == FINANCE:
+        for option in game.available_financing(player):
+            index = game.financing_options.index(option)
+            if option.name in ("Debt", "Equity"):
+                amounts = sorted({max(1, round(option.max_amount * step)) for step in AMOUNT_STEPS})
+                actions.extend((index, amount) for amount in amounts)
+            else:
+                actions.append((index, option.max_amount))
+    elif kind == STRATEGY:
+        for project in player.projects:
+            index = game.projects.index(project)
+            if player.can_afford(EXPAND_COST):
+                actions.append((index, "Expand"))
+            if player.can_afford(PIVOT_COST):
+                actions.append((index, "Pivot"))
+            actions.append((index, "Sell"))
+    return actions
+
+
+def to_choice(game, kind, action):
+    """Turn an action from ``legal_actions`` into what the ``Policy`` method returns."""
+    if action is None or kind in (INVEST, IPO):
+        return action
+    index, value = action
+    if kind == FINANCE:
+        return game.financing_options[index], value
+    return game.projects[index], value
+
+
+def describe_action(game, player, kind, action):
+    if kind == INVEST:
+        project = game.board[player.position].action
+        return f"invest in {project.name}" if action else f"pass on {project.name}"
+    if kind == IPO:
+        return "conduct an IPO" if action else "skip the IPO"
+    if action is None:
+        return "skip financing" if kind == FINANCE else "make no strategic move"
+    index, value = action
+    if kind == FINANCE:
+        return f"take ${value}M of {game.financing_options[index].name}"
+    return f"{value.lower()} {game.projects[index].name}"
+
+
+def outcome(game, player):
+    """The searching seat's reward for a finished game, in [0, 1]."""
+    if player not in game.players:
+        return 0.0
+    others = len(game.seats) - 1
+    if not others:
+        return 1.0
+    scores = game.final_scores()
+    own = next(total for p, total, *_ in scores if p is player)
+    ahead = sum(1 for _, total, *_ in scores if total > own)
+    return (others - ahead) / others
+
+
+# --- Search ---
+class Node:
+    __slots__ = ("children", "visits", "value")
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+
+    def select(self, keys, rng, exploration):
+        """Pick a child key by UCB1, trying unvisited keys first; returns ``(key, new)``."""
+        untried = [key for key in keys if key not in self.children]
+        if untried:
+            key = rng.choice(untried)
+            self.children[key] = Node()
+            return key, True
+        log_visits = math.log(self.visits)
+        children = self.children
+
+        def ucb(key):
+            child = children[key]
+            return child.value / child.visits + exploration * math.sqrt(log_visits / child.visits)
+        return max(keys, key=ucb), False
+
+
+class TreePolicy(Policy):
+    """Plays the searching seat in a clone: down the tree, then like ``rollout``."""
+
+    def __init__(self, rollout, rng, exploration):
+        self.rollout = rollout
+        self.rng = rng
+        self.exploration = exploration
+        self.node = None
+        self.path = []
+
+    def start(self, root):
+        self.node = root
+        self.path = [root]
+
+    def descend(self, game, player, kind):
+        keys = [(kind, action) for action in legal_actions(game, player, kind)]
+        key, new = self.node.select(keys, self.rng, self.exploration)
+        child = self.node.children[key]
+        self.path.append(child)
+        self.node = None if new else child
+        return to_choice(game, kind, key[1])
+
+    def choose_investment(self, game, player, project):
+        if self.node is None:
+            return self.rollout.choose_investment(game, player, project)
+        return self.descend(game, player, INVEST)
+
+    def choose_financing(self, game, player, options):
+        if self.node is None:
+            return self.rollout.choose_financing(game, player, options)
+        return self.descend(game, player, FINANCE)
+
+    def choose_ipo(self, game, player):
+        if self.node is None:
+            return self.rollout.choose_ipo(game, player)
+        return self.descend(game, player, IPO)
+
+    def choose_strategy(self, game, player):
+        if self.node is None:
+            return self.rollout.choose_strategy(game, player)
+        return self.descend(game, player, STRATEGY)
+
+
+def search(state, positions, names, catalog, seat, deadline, iterations, seed, stream, exploration, rollout):
+    """Grow one tree from ``state``; returns ``{(kind, action): (visits, value)}`` at the root.
+
+    ``state`` must have been taken while seat ``seat`` was deciding on the
+    tile it stands on. Runs until ``deadline`` (``time.time()``) or
+    ``iterations`` playouts, whichever comes first.
+    """
+    rng = RandomStream(seed, stream=stream)
+    clone = FinopolyEngine(rng=rng, default_policy=rollout, layouts=[positions], catalog=catalog)
+    clone.log = None
+    for name in names:
+        clone.add_player(name)
+    tree = TreePolicy(rollout, rng, exploration)
+    player = clone.seats[seat]
+    player.policy = tree
+    root = Node()
+    done = 0
+    while done < iterations and time.time() < deadline:
+        restore(clone, state)
+        tree.start(root)
+        clone.handle_tile(player, clone.board[player.position])
+        clone.next_player_turn()
+        while not clone.game_over:
+            clone.take_turn()
+        reward = outcome(clone, player)
+        for node in tree.path:
+            node.visits += 1
+            node.value += reward
+        done += 1
+    return {key: (child.visits, child.value) for key, child in root.children.items()}
+
+
+class MCTSPolicy(Policy):
+    """A computer seat that searches every decision for ``budget`` seconds.
+
+    ``workers`` defaults to one search process per CPU; with one, the search
+    runs in the calling process. ``iterations`` caps the playouts per
+    worker, which with a ``seed`` makes decisions reproducible.
+    """
+
+    def __init__(self, budget=BUDGET, workers=None, iterations=None, rollout=None, exploration=EXPLORATION, seed=None):
+        self.budget = budget
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.iterations = iterations if iterations is not None else math.inf
+        self.rollout = rollout if rollout is not None else RandomPolicy()
+        self.exploration = exploration
+        self.rng = RandomStream(seed)
+        self.last_move = None # Description of the latest decision, for display
+        self.last_playouts = 0
+
+    def decide(self, game, player, kind):
+        actions = legal_actions(game, player, kind)
+        action = actions[0]
+        self.last_playouts = 0
+        if len(actions) > 1:
+            stats = self.search(game, player)
+            if stats:
+                self.last_playouts = sum(visits for visits, _ in stats.values())
+                (_, action), _ = max(stats.items(), key=lambda item: item[1])
+        self.last_move = describe_action(game, player, kind, action)
+        return to_choice(game, kind, action)
+
+    def search(self, game, player):
+        """Root statistics summed over every worker's tree."""
+        catalog = None if game.catalog is shared_catalog() else game.catalog
+        seed = self.rng.randrange(2 ** 32)
+        args = (snapshot(game), game.board_positions, [p.name for p in game.seats], catalog,
+                game.seats.index(player), time.time() + self.budget, self.iterations, seed)
+        if self.workers <= 1:
+            results = [search(*args, 0, self.exploration, self.rollout)]
+        else:
+            pool = worker_pool(self.workers)
+            futures = [pool.submit(search, *args, stream, self.exploration, self.rollout) for stream in range(self.workers)]
+            results = [future.result() for future in futures]
+        totals = {}
+        for result in results:
+            for key, (visits, value) in result.items():
+                total = totals.get(key, (0, 0.0))
+                totals[key] = (total[0] + visits, total[1] + value)
+        return totals
+
+    def choose_investment(self, game, player, project):
+        return self.decide(game, player, INVEST)
+
+    def choose_financing(self, game, player, options):
+        return self.decide(game, player, FINANCE)
+
+    def choose_ipo(self, game, player):
+        return self.decide(game, player, IPO)
+
+    def choose_strategy(self, game, player):
+        return self.decide(game, player, STRATEGY)
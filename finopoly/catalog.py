@@ -0,0 +1,127 @@
+"""Static Finopoly content, built once per process and shared by every game.
+
+Nothing in here changes during play: project terms, financing options,
+events and the non-investment board tiles. Per-game state lives in the
+``Project`` overlays and ``Player`` objects that ``FinopolyEngine`` creates
+on top of this catalog.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from .events import ADD, REVENUE, SET, Effect
+
+# Tiles of each type, in the order create_board takes positions for them.
+TILE_COUNTS = {
+    "Investment": 8,
+    "Financing": 2,
+    "Event": 4,
+    "Neutral": 4,
+    "Special": 2
+}
+BOARD_SIZE = 20
+
+# Original terms of a project. Expand/Pivot change the per-game overlay only.
+ProjectSpec = namedtuple("ProjectSpec", "name cost life annual_cash_flow real_option risk_level user_gain")
+
+
+# --- FinancingOption Class ---
+class FinancingOption:
+    def __init__(self, name, description, max_amount, conditions, impact):
+        self.name = name
+        self.description = description
+        self.max_amount = max_amount
+        self.conditions = conditions
+        self.impact = impact
+
+
+# --- Event Class ---
+class Event:
+    """A drawable event; ``impact`` is an ``events.Effect`` describing what it does."""
+
+    def __init__(self, name, description, impact):
+        self.name = name
+        self.description = description
+        self.impact = impact
+
+
+# --- Tile Class ---
+class Tile:
+    __slots__ = ("position", "name", "tile_type", "action")
+
+    def __init__(self, position, name, tile_type, action=None):
+        self.position = position
+        self.name = name
+        self.tile_type = tile_type
+        self.action = action
+
+
+class GameCatalog:
+    """Projects, financing options, events and fixed tiles for one process."""
+
+    def __init__(self):
+        self.projects = (
+            ProjectSpec("Expand to Asia Market", 50, 3, 20, "Expand", "High", 2),
+            ProjectSpec("Referral Program", 20, 3, 12, "Scale", "Low", 1.5),
+            ProjectSpec("Retail Partnership", 40, 3, 18, "User Trust", "High", 1.8),
+            ProjectSpec("AI Fraud Prevention", 30, 3, 15, "Efficiency Gain", "Medium", 1),
+            ProjectSpec("Product Launch", 35, 2, 25, "Rebrand", "Medium", 2.5),
+            ProjectSpec("Mobile App Redesign", 25, 2, 15, "User Experience", "Low", 1.2),
+            ProjectSpec("Blockchain Integration", 45, 3, 17, "Security", "High", 1.5),
+            ProjectSpec("Customer Support AI", 30, 2, 18, "Efficiency", "Medium", 0.8)
+        )
+        self.financing_options = (
+            FinancingOption("Debt", "Loan at 6% annual interest", 50, "Max $50M per round", "6% annual interest"),
+            FinancingOption("VC Funding", "Raise $40M but lose 10% NPV", 40, "Once per game", "10% NPV dilution"),
+            FinancingOption("Equity", "Raise capital but dilute 20% NPV", 60, "Once per round", "20% NPV dilution"),
+            FinancingOption("IPO", "Raise $100M but lose 30% of final NPV", 100, "Only in Round 4 or 5", "30% NPV penalty")
+        )
+        self.events = (
+            Event("Economic Downturn", "Economic downturn affects revenue", Effect("cash", ADD, -0.15, per=REVENUE)),
+            Event("Cybersecurity Breach", "Security breach costs money", Effect("cash", ADD, -15, unless_owns=("AI Fraud Prevention", "Blockchain Integration"))),
+            Event("Data Leak Scandal", "Data leak affects user trust", Effect("users", ADD, -1, floor=0)),
+            Event("Regulatory Fine", "Regulatory issues lead to fine", Effect("cash", ADD, -10, unless_owns=("AI Fraud Prevention",))),
+            Event("System Crash", "Major system failure", Effect("skip_next_turn", SET, True)),
+            Event("Market Expansion", "New market opportunity", Effect("users", ADD, 0.5)),
+            Event("Strategic Partnership", "New partnership opportunity", Effect("cash", ADD, 10)),
+            Event("Talent Acquisition", "Key talent joins company", Effect("next_project_discount", SET, 0.10))
+        )
+        self.investment_names = tuple(f"Investment: {spec.name}" for spec in self.projects)
+        # Every fixed tile a board can have, one per kind and square.
+        self.fixed_tiles = {
+            kind: tuple(Tile(pos, name, tile_type, action) for pos in range(BOARD_SIZE))
+            for kind, name, tile_type, action in (
+                ("Financing", "Financing Opportunity", "Financing", None),
+                ("Event", "Market Event", "Event", None),
+                ("Neutral", "Revenue Collection", "Neutral", None),
+                ("IPO", "IPO Opportunity", "Special", "IPO"),
+                ("Strategy", "Strategic Decision", "Special", "Strategy"),
+            )
+        }
+
+    def fixed_board(self, positions):
+        """New board for a position list with every tile but the investments placed.
+
+        Investment squares are ``None``; the other tiles are shared between
+        games and must not be mutated.
+        """
+        investments = TILE_COUNTS["Investment"]
+        financing = investments + TILE_COUNTS["Financing"]
+        events = financing + TILE_COUNTS["Event"]
+        neutral = events + TILE_COUNTS["Neutral"]
+        tiles = self.fixed_tiles
+        board = [None] * BOARD_SIZE
+        for pos in positions[investments:financing]:
+            board[pos] = tiles["Financing"][pos]
+        for pos in positions[financing:events]:
+            board[pos] = tiles["Event"][pos]
+        for pos in positions[events:neutral]:
+            board[pos] = tiles["Neutral"][pos]
+        board[positions[neutral]] = tiles["IPO"][positions[neutral]]
+        board[positions[neutral + 1]] = tiles["Strategy"][positions[neutral + 1]]
+        return board
+
+
+@lru_cache(maxsize=1)
+def shared_catalog():
+    """The process-wide ``GameCatalog`` every engine uses unless given another."""
+    return GameCatalog()
@@ -0,0 +1,566 @@
+"""Headless Finopoly rules.
+
+Nothing here imports Streamlit: every choice a player makes is delegated to a
+``Policy`` so a whole game can be played in a plain Python loop.
+"""
+from .catalog import TILE_COUNTS, Event, FinancingOption, Tile, shared_catalog
+from .events import apply_effect
+from .irr import irr
+from .rng import RandomStream
+from .turnlog import TurnLog
+from .valuation import DEFAULT_RATE, IPO_NPV_FACTOR, annuity_factor
+
+DEBT_INTEREST = 0.06 # Charged on all outstanding debt at the end of each round
+VC_DILUTION = 0.10
+EQUITY_DILUTION = 0.20
+# end_game score weights
+NPV_WEIGHT = 0.4
+USERS_WEIGHT = 0.3
+CASH_WEIGHT = 0.1
+STRATEGIC_WEIGHT = 0.2
+IPO_BONUS = 10 # Strategic points, before STRATEGIC_WEIGHT
+PROJECT_BONUS = 2 # Strategic points per project owned
+# Strategy tile moves
+EXPAND_COST, EXPAND_FACTOR = 20, 1.5
+PIVOT_COST, PIVOT_FACTOR, PIVOT_EXTRA_LIFE = 15, 1.2, 1
+SALE_RECOVERY = 0.5 # Share of the project's cost refunded on a sale
+
+
+# --- Project Class ---
+class Project:
+    """One game's copy of a catalog project.
+
+    The terms come from the shared ``ProjectSpec``; only the fields a game
+    changes are stored here. ``adjustments`` starts as the shared empty
+    tuple and is replaced, never appended to, when the project changes. It
+    only covers the current owner: a new owner buys the project on its
+    current terms, so ``Player.add_project`` and ``remove_project`` clear it.
+    """
+    __slots__ = ("spec", "owner", "purchase_round", "annual_cash_flow", "life", "adjustments")
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.owner = None
+        self.purchase_round = None
+        self.annual_cash_flow = spec.annual_cash_flow
+        self.life = spec.life
+        self.adjustments = ()
+
+    @property
+    def name(self):
+        return self.spec.name
+
+    @property
+    def cost(self):
+        return self.spec.cost
+
+    @property
+    def real_option(self):
+        return self.spec.real_option
+
+    @property
+    def risk_level(self):
+        return self.spec.risk_level
+
+    @property
+    def user_gain(self):
+        return self.spec.user_gain
+
+    @property
+    def base_cash_flow(self):
+        return self.spec.annual_cash_flow
+
+    @property
+    def base_life(self):
+        return self.spec.life
+
+    def record_adjustment(self, elapsed, factor, extra_years, cost):
+        """Note an Expand/Pivot made ``elapsed`` years after purchase."""
+        self.adjustments = self.adjustments + ((elapsed, factor, extra_years, cost),)
+
+    def cash_flow_schedule(self):
+        """Year-end cash flows from purchase, including Expand/Pivot changes."""
+        # Terms at purchase: the current ones with this owner's changes undone.
+        level, life = self.annual_cash_flow, self.life
+        for _, factor, extra_years, _ in self.adjustments:
+            level /= factor
+            life -= extra_years
+        flows = [-self.cost] + [level] * life
+        for elapsed, factor, extra_years, cost in self.adjustments:
+            elapsed = max(0, min(elapsed, len(flows) - 1))
+            flows[elapsed] -= cost
+            for year in range(elapsed + 1, len(flows)):
+                flows[year] *= factor
+            level *= factor
+            flows.extend([level] * extra_years)
+        return flows
+
+    def calculate_npv(self, discount_rate=DEFAULT_RATE):
+        return self.annual_cash_flow * annuity_factor(discount_rate, self.life) - self.cost
+
+    def calculate_irr(self):
+        return float(irr(self.cash_flow_schedule()))
+
+    def calculate_payback_period(self):
+        return self.cost / self.annual_cash_flow
+
+    def calculate_profitability_index(self, discount_rate=DEFAULT_RATE):
+        return self.annual_cash_flow * annuity_factor(discount_rate, self.life) / self.cost
+
+
+# --- Player Class ---
+class Player:
+    def __init__(self, name, starting_cash=100, policy=None):
+        self.name = name
+        self.cash = starting_cash
+        self.users = 1
+        self.position = 0
+        self.projects = []
+        self.financing_history = []
+        self.debt = 0
+        self.equity_dilution = 0
+        self.vc_funding_used = False
+        self.ipo_done = False
+        self.skip_next_turn = False
+        self.next_project_discount = 0
+        self.policy = policy
+        # Running aggregates over self.projects, kept in step by add_project,
+        # adjust_project, remove_project and expire_projects.
+        self.total_cash_flow = 0
+        self.cash_flow_by_expiry = {} # Round a project's life runs out -> summed cash flow
+        self.owned_names = {} # Project name -> number owned
+
+    def _track(self, project, sign):
+        cash_flow = sign * project.annual_cash_flow
+        expiry = project.purchase_round + project.life
+        self.total_cash_flow += cash_flow
+        self.cash_flow_by_expiry[expiry] = self.cash_flow_by_expiry.get(expiry, 0) + cash_flow
+        count = self.owned_names.get(project.name, 0) + sign
+        if count:
+            self.owned_names[project.name] = count
+        else:
+            del self.owned_names[project.name]
+
+    def rebuild_aggregates(self):
+        """Recompute the aggregates after ``projects`` was replaced wholesale."""
+        self.total_cash_flow = 0
+        self.cash_flow_by_expiry = {}
+        self.owned_names = {}
+        for project in self.projects:
+            self._track(project, 1)
+
+    def owns(self, name):
+        return name in self.owned_names
+
+    def calculate_total_npv(self, current_round):
+        total_npv = 0
+        for expiry, cash_flow in self.cash_flow_by_expiry.items():
+            total_npv += cash_flow * annuity_factor(DEFAULT_RATE, expiry - current_round)
+        total_npv *= (1 - self.equity_dilution)
+        if self.ipo_done:
+            total_npv *= IPO_NPV_FACTOR
+        return total_npv
+
+    def can_afford(self, amount):
+        return self.cash >= amount
+
+    def pay(self, amount):
+        if self.can_afford(amount):
+            self.cash -= amount
+            return True
+        return False
+
+    def receive(self, amount):
+        self.cash += amount
+
+    def add_users(self, count):
+        self.users += count
+
+    def lose_users(self, count):
+        self.users = max(0, self.users - count)
+
+    def add_project(self, project, current_round):
+        project.owner = self
+        project.purchase_round = current_round
+        project.adjustments = ()
+        self.projects.append(project)
+        self._track(project, 1)
+
+    def adjust_project(self, project, factor, extra_life=0):
+        """Scale an owned project's cash flow and extend its life."""
+        self._track(project, -1)
+        project.annual_cash_flow *= factor
+        project.life += extra_life
+        self._track(project, 1)
+
+    def remove_project(self, project):
+        self._track(project, -1)
+        self.projects.remove(project)
+        project.owner = None
+        project.adjustments = ()
+
+    def expire_projects(self, current_round):
+        """Drop expiry buckets that no longer add NPV; they still earn revenue."""
+        for expiry in [e for e in self.cash_flow_by_expiry if e <= current_round]:
+            del self.cash_flow_by_expiry[expiry]
+
+    def add_financing(self, financing, amount):
+        self.financing_history.append((financing, amount))
+        if financing.name == "Debt":
+            self.debt += amount
+        elif financing.name == "VC Funding":
+            self.vc_funding_used = True
+            self.equity_dilution += VC_DILUTION
+        elif financing.name == "Equity":
+            self.equity_dilution += EQUITY_DILUTION
+        elif financing.name == "IPO":
+            self.ipo_done = True
+
+    def pay_debt_interest(self):
+        interest = self.debt * DEBT_INTEREST
+        if self.can_afford(interest):
+            self.cash -= interest
+            return True
+        return False
+
+    def collect_project_revenues(self):
+        total_revenue = self.total_cash_flow
+        self.cash += total_revenue
+        return total_revenue
+
+
+# --- Policies ---
+class Policy:
+    """Decision callbacks for one seat. The base class always passes."""
+
+    def choose_investment(self, game, player, project):
+        return False
+
+    def choose_financing(self, game, player, options):
+        """Return ``(option, amount)`` or ``None`` to skip."""
+        return None
+
+    def choose_ipo(self, game, player):
+        return False
+
+    def choose_strategy(self, game, player):
+        """Return ``(project, action)`` with action in Expand/Pivot/Sell, or ``None``."""
+        return None
+
+
+class RandomPolicy(Policy):
+    """Picks uniformly among the moves a human could click."""
+
+    def choose_investment(self, game, player, project):
+        return game.rng.random() < 0.5
+
+    def choose_financing(self, game, player, options):
+        choice = game.rng.choice([None] + options)
+        if choice is None:
+            return None
+        if choice.name in ("Debt", "Equity"):
+            return choice, game.rng.randint(1, choice.max_amount)
+        return choice, choice.max_amount
+
+    def choose_ipo(self, game, player):
+        return game.rng.random() < 0.5
+
+    def choose_strategy(self, game, player):
+        action = game.rng.choice(["Skip", "Expand", "Pivot", "Sell"])
+        if action == "Skip":
+            return None
+        return game.rng.choice(player.projects), action
+
+
+class GreedyPolicy(Policy):
+    """Buys every positive-NPV project it can afford and never raises money."""
+
+    def choose_investment(self, game, player, project):
+        return project.calculate_npv() > 0
+
+
+# --- Finopoly Engine ---
+class FinopolyEngine:
+    def __init__(self, rng=None, default_policy=None, layouts=None, catalog=None, seed=None):
+        self.players = []
+        self.seats = [] # Every player added, in seating order, bankrupt or not
+        self.turn = 0 # Turns ended so far
+        self.current_round = 1
+        self.current_player_index = 0
+        self.board = []
+        self.projects = []
+        self.financing_options = []
+        self.events = []
+        self.game_over = False
+        self.num_rounds = 5 # Set the number of rounds
+        self.rng = rng if rng is not None else RandomStream(seed) # Or anything with random.Random's methods
+        self.default_policy = default_policy if default_policy is not None else Policy()
+        self.layouts = layouts # Position lists from finopoly.boards; shuffle when empty
+        self.catalog = catalog if catalog is not None else shared_catalog()
+
+        self.initialize_game()
+        self.log = TurnLog(self.board_positions) # Set to None to stop recording
+
+    def initialize_game(self):
+        self.create_projects()
+        self.create_financing_options()
+        self.create_events()
+        self.create_board()
+
+    def create_projects(self):
+        self.projects = [Project(spec) for spec in self.catalog.projects]
+
+    def create_financing_options(self):
+        self.financing_options = self.catalog.financing_options
+
+    def create_events(self):
+        self.events = self.catalog.events
+
+    def create_board(self):
+        if self.layouts:
+            positions = self.rng.choice(self.layouts)
+        else:
+            positions = list(range(20))
+            self.rng.shuffle(positions)
+
+        self.board_positions = tuple(positions)
+        self.board = self.catalog.fixed_board(positions)
+
+        names = self.catalog.investment_names
+        for i, pos in enumerate(positions[:TILE_COUNTS["Investment"]]):
+            project = self.projects[i % len(self.projects)]
+            self.board[pos] = Tile(pos, names[i % len(names)], "Investment", project)
+
+    def add_player(self, name, policy=None):
+        player = Player(name, policy=policy)
+        self.players.append(player)
+        self.seats.append(player)
+        if self.log is not None:
+            self.log.add_player(name, bot=policy is not None) # Seats with their own policy are computer-played
+        return player
+
+    def policy_for(self, player):
+        return player.policy if player.policy is not None else self.default_policy
+
+    def roll_dice(self):
+        roll = self.rng.randint(1, 6)
+        if self.log is not None:
+            self.log.record_roll(roll)
+        return roll
+
+    def move_player(self, player, steps):
+        player.position = (player.position + steps) % len(self.board)
+        return self.board[player.position]
+
+    def get_current_tile(self, player):
+        return self.board[player.position]
+
+    # --- Rule primitives shared by the headless handlers and the UI ---
+    def invest(self, player, project):
+        if project.owner is not None or not player.pay(project.cost):
+            return False
+        player.add_project(project, self.current_round)
+        player.add_users(project.user_gain)
+        if self.log is not None:
+            self.log.record_invest()
+        return True
+
+    def available_financing(self, player):
+        available_options = []
+        for option in self.financing_options:
+            if option.name == "VC Funding" and player.vc_funding_used:
+                continue
+            if option.name == "IPO" and self.current_round < 4:
+                continue
+            available_options.append(option)
+        return available_options
+
+    def take_financing(self, player, option, amount):
+        player.receive(amount)
+        player.add_financing(option, amount)
+        if self.log is not None:
+            self.log.record_financing(self.financing_options.index(option), amount)
+
+    def can_ipo(self, player):
+        return self.current_round >= 4 and not player.ipo_done
+
+    def conduct_ipo(self, player):
+        player.receive(100)
+        player.ipo_done = True
+        if self.log is not None:
+            self.log.record_ipo()
+
+    def draw_event(self):
+        index = self.rng.randrange(len(self.events))
+        if self.log is not None:
+            self.log.record_event(index)
+        return self.events[index]
+
+    def apply_event(self, player, event):
+        apply_effect(event.impact, player)
+
+    def expand_project(self, player, project):
+        if not player.pay(EXPAND_COST):
+            return False
+        player.adjust_project(project, EXPAND_FACTOR)
+        project.record_adjustment(self.current_round - project.purchase_round, EXPAND_FACTOR, 0, EXPAND_COST)
+        if self.log is not None:
+            self.log.record_strategy(self.projects.index(project), "Expand")
+        return True
+
+    def pivot_project(self, player, project):
+        if not player.pay(PIVOT_COST):
+            return False
+        player.adjust_project(project, PIVOT_FACTOR, extra_life=PIVOT_EXTRA_LIFE)
+        project.record_adjustment(self.current_round - project.purchase_round, PIVOT_FACTOR, PIVOT_EXTRA_LIFE, PIVOT_COST)
+        if self.log is not None:
+            self.log.record_strategy(self.projects.index(project), "Pivot")
+        return True
+
+    def sell_project(self, player, project):
+        recovery = project.cost * SALE_RECOVERY
+        player.receive(recovery)
+        player.remove_project(project)
+        if self.log is not None:
+            self.log.record_strategy(self.projects.index(project), "Sell")
+        return recovery
+
+    def apply_strategy(self, player, project, action):
+        if action == "Expand":
+            return self.expand_project(player, project)
+        if action == "Pivot":
+            return self.pivot_project(player, project)
+        if action == "Sell":
+            self.sell_project(player, project)
+            return True
+        return False
+
+    # --- Headless tile handlers ---
+    def handle_tile(self, player, tile):
+        """Resolve ``tile`` for ``player``; returns what the tile's handler returns."""
+        if tile.tile_type == "Investment":
+            return self.handle_investment_tile(player, tile)
+        elif tile.tile_type == "Financing":
+            return self.handle_financing_tile(player, tile)
+        elif tile.tile_type == "Event":
+            return self.handle_event_tile(player, tile)
+        elif tile.tile_type == "Neutral":
+            return self.handle_neutral_tile(player, tile)
+        elif tile.tile_type == "Special":
+            return self.handle_special_tile(player, tile)
+
+    def handle_investment_tile(self, player, tile):
+        project = tile.action
+        if project.owner is not None or not player.can_afford(project.cost):
+            return
+        if self.policy_for(player).choose_investment(self, player, project):
+            self.invest(player, project)
+
+    def handle_financing_tile(self, player, tile):
+        available_options = self.available_financing(player)
+        if not available_options:
+            return
+        choice = self.policy_for(player).choose_financing(self, player, available_options)
+        if choice is None:
+            return
+        option, amount = choice
+        amount = min(amount, option.max_amount)
+        if amount > 0:
+            self.take_financing(player, option, amount)
+
+    def handle_event_tile(self, player, tile):
+        event = self.draw_event()
+        self.apply_event(player, event)
+        return event
+
+    def handle_neutral_tile(self, player, tile):
+        return player.collect_project_revenues()
+
+    def handle_special_tile(self, player, tile):
+        if tile.action == "IPO":
+            if self.can_ipo(player) and self.policy_for(player).choose_ipo(self, player):
+                self.conduct_ipo(player)
+        elif tile.action == "Strategy":
+            if not player.projects:
+                return
+            choice = self.policy_for(player).choose_strategy(self, player)
+            if choice is not None:
+                project, action = choice
+                self.apply_strategy(player, project, action)
+
+    # --- Round and game flow ---
+    def settle_round(self):
+        """Charge debt interest and drop everyone who cannot pay it."""
+        bankrupt_players = []
+        for player in self.players:
+            if player.debt > 0:
+                if not player.pay_debt_interest():
+                    bankrupt_players.append(player)
+
+        for player in bankrupt_players:
+            self.players.remove(player)
+        return bankrupt_players
+
+    def advance_round(self):
+        self.current_round += 1
+        for player in self.players:
+            player.expire_projects(self.current_round)
+        if self.current_round > self.num_rounds or not self.players: # Everyone may go bankrupt at once
+            self.game_over = True
+
+    def handle_end_of_round(self):
+        bankrupt_players = self.settle_round()
+        self.advance_round()
+        return bankrupt_players
+
+    def final_scores(self):
+        """Return ``(player, total, npv, users, cash, strategic)`` rows, best first."""
+        final_scores = []
+        for player in self.players:
+            npv = player.calculate_total_npv(self.current_round)
+            npv_score = npv * NPV_WEIGHT
+            users_score = player.users * USERS_WEIGHT
+            cash_score = player.cash * CASH_WEIGHT
+            strategic_score = 0
+            if player.ipo_done:
+                strategic_score += IPO_BONUS
+            strategic_score += len(player.projects) * PROJECT_BONUS
+            strategic_score *= STRATEGIC_WEIGHT
+            total_score = npv_score + users_score + cash_score + strategic_score
+            final_scores.append((player, total_score, npv, player.users, player.cash, strategic_score))
+
+        final_scores.sort(key=lambda x: x[1], reverse=True)
+        return final_scores
+
+    def end_game(self):
+        self.game_over = True
+        return self.final_scores()
+
+    def next_player_turn(self):
+        if not self.players:
+            self.game_over = True
+            return
+        if self.log is not None:
+            self.log.end_turn()
+        self.turn += 1
+        self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        if self.current_player_index == 0:
+            self.handle_end_of_round()
+
+    def take_turn(self):
+        """Play the current player's turn without any UI and move on."""
+        if not self.players:
+            self.game_over = True
+            return
+        player = self.players[self.current_player_index]
+        if player.skip_next_turn:
+            player.skip_next_turn = False
+        else:
+            tile = self.move_player(player, self.roll_dice())
+            self.handle_tile(player, tile)
+        self.next_player_turn()
+
+    def play_game(self):
+        while not self.game_over:
+            self.take_turn()
+        return self.end_game()
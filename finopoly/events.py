@@ -0,0 +1,109 @@
+"""Event effects as data, with one executor for a player and one for arrays.
+
+An ``Effect`` says which player field an event changes, how (``ADD`` a
+signed amount or ``SET`` a value), by how much, and when it does not apply:
+
+* ``per`` scales the magnitude by a per-player basis; ``"revenue"`` is the
+  player's total project cash flow (``Player.total_cash_flow``);
+* ``floor`` clamps the result from below;
+* ``unless_owns`` names projects that protect the player entirely.
+
+``apply_effect`` runs one effect on one ``Player``. ``EventTable`` compiles
+the catalog's events into arrays so ``apply_columns`` can apply a different
+drawn event to each of many games in one vectorized pass.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+ADD = "add"
+SET = "set"
+REVENUE = "revenue"
+
+Effect = namedtuple("Effect", "field op magnitude per floor unless_owns", defaults=(None, None, ()))
+
+
+def player_basis(player, per):
+    if per == REVENUE:
+        return player.total_cash_flow
+    raise ValueError(f"Unknown effect basis {per!r}")
+
+
+def apply_effect(effect, player):
+    """Apply ``effect`` to ``player``; returns whether it applied."""
+    if effect.unless_owns and any(player.owns(name) for name in effect.unless_owns):
+        return False
+    value = effect.magnitude
+    if effect.per is not None:
+        value = value * player_basis(player, effect.per)
+    if effect.op == ADD:
+        value = getattr(player, effect.field) + value
+        if effect.floor is not None:
+            value = max(effect.floor, value)
+    elif effect.op != SET:
+        raise ValueError(f"Unknown effect operation {effect.op!r}")
+    setattr(player, effect.field, value)
+    return True
+
+
+def describe(effect):
+    """One-line summary of an effect for display."""
+    if effect.op == SET:
+        text = f"{effect.field} set to {effect.magnitude}"
+    else:
+        amount = f"{abs(effect.magnitude):g}" if effect.per is None else f"{abs(effect.magnitude):.0%} of {effect.per}"
+        text = f"{effect.field} {'+' if effect.magnitude >= 0 else '-'}{amount}"
+        if effect.floor is not None:
+            text += f" (not below {effect.floor:g})"
+    if effect.unless_owns:
+        text += f", unless you own {' or '.join(effect.unless_owns)}"
+    return text
+
+
+class EventTable:
+    """A list of events compiled to arrays, indexed by event number.
+
+    ``project_names`` fixes the column order of the ``owned`` masks passed
+    to ``apply_columns``.
+    """
+
+    def __init__(self, events, project_names):
+        effects = [event.impact for event in events]
+        # Effects sharing field, operation, basis and floor are applied together.
+        self.groups = sorted({(e.field, e.op, e.per, e.floor) for e in effects}, key=str)
+        self.group = np.array([self.groups.index((e.field, e.op, e.per, e.floor)) for e in effects], dtype=np.int8)
+        self.magnitude = np.array([float(e.magnitude) for e in effects])
+        self.guard = np.array([[name in e.unless_owns for name in project_names] for e in effects], dtype=bool)
+        self.guarded = self.guard.any(axis=1)
+
+    def apply_columns(self, columns, games, event, owned=None, basis=None):
+        """Apply event ``event[i]`` to game ``games[i]`` in place.
+
+        ``columns`` maps a field name to a per-game 1-D array (fields with no
+        column are skipped), ``owned`` is a ``(len(games), projects)`` mask of
+        the mover's projects and ``basis`` maps a ``per`` name to per-game
+        values aligned with ``games``.
+        """
+        live = np.ones(games.size, dtype=bool)
+        if owned is not None:
+            guarded = self.guarded[event]
+            live[guarded] = ~(owned[guarded] & self.guard[event[guarded]]).any(axis=1)
+        group = self.group[event]
+        for code, (field, op, per, floor) in enumerate(self.groups):
+            column = columns.get(field)
+            if column is None:
+                continue
+            hit = live & (group == code)
+            if not hit.any():
+                continue
+            rows = games[hit]
+            value = self.magnitude[event[hit]]
+            if per is not None:
+                value = value * basis[per][hit]
+            if op == SET:
+                column[rows] = value
+            else:
+                updated = column[rows] + value
+                if floor is not None:
+                    updated = np.maximum(floor, updated)
+                column[rows] = updated
@@ -0,0 +1,191 @@
+"""Live games shared by every session in the process, with turn notifications.
+
+``st.session_state`` is private to one browser tab. The hub lets several
+tabs, one per player, hold the same ``Finopoly`` object instead. It maps a
+game id to a ``Table`` that holds:
+
+* the game;
+* a lock that serializes moves;
+* the game's ``version`` as of the last published turn;
+* an ``asyncio.Event`` that is set, then replaced, each time the version
+  moves on.
+
+The hub's event loop runs on its own daemon thread. Streamlit script
+threads call into it with the blocking methods below:
+
+* ``lock`` holds a table's lock;
+* ``publish`` announces a new version;
+* ``wait`` sleeps until the version differs from the one the caller
+  rendered, or a timeout passes.
+
+A table stays shared while a session holds the token from ``attach`` or a
+thread waits on it. Once neither holds and nothing has touched it for
+``IDLE_SECONDS``, the next ``open`` drops it; ``close`` drops it at once.
+
+A thread in ``wait`` wakes within a millisecond of ``publish``, and a turn
+on one table wakes no one watching another. The app waits from a fragment
+that reruns on a timer, and each wait lasts the whole timer interval, so
+no publish falls between waits: a browser starts rerendering the new turn
+within a millisecond of ``publish``. Streamlit cannot interrupt a
+script thread stuck in a call into another loop, so the interval stays
+short: the session's own widgets wait at most that long. Coroutines on the
+hub's loop can use ``subscribe`` instead.
+"""
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+IDLE_SECONDS = 3600 # Unused tables untouched this long are dropped when another opens
+WAIT_SECONDS = 1.0
+
+
+class Table:
+    def __init__(self, game):
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.version = getattr(game, "version", 0)
+        self.changed = asyncio.Event()
+        self.touched = time.monotonic()
+        self.waiters = 0
+        self.sessions = weakref.WeakSet() # Tokens from attach(); gone once their session is
+
+    def idle(self, now, idle_seconds):
+        return now - self.touched > idle_seconds and not self.waiters and not self.sessions
+
+
+class Session:
+    """Token a browser session keeps while it shows a table; see ``GameHub.attach``."""
+
+
+class GameHub:
+    """Registry of shared tables by game id. All table state lives on the hub's loop."""
+
+    def __init__(self, idle_seconds=IDLE_SECONDS):
+        self.idle_seconds = idle_seconds
+        self.tables = {}
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="finopoly-hub", daemon=True)
+        self.thread.start()
+
+    def call(self, coroutine, timeout=None):
+        """Run ``coroutine`` on the hub's loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    # --- Registry ---
+    async def _table(self, game_id):
+        table = self.tables.get(game_id)
+        if table is not None:
+            table.touched = time.monotonic()
+        return table
+
+    async def _open(self, game):
+        now = time.monotonic()
+        for game_id in [i for i, t in self.tables.items() if t.idle(now, self.idle_seconds)]:
+            del self.tables[game_id]
+        table = await self._table(game.game_id)
+        if table is None:
+            table = self.tables[game.game_id] = Table(game)
+        return table.game
+
+    def open(self, game):
+        """Share ``game`` under its id; returns the game already shared under that id, if any."""
+        return self.call(self._open(game))
+
+    async def _get(self, game_id):
+        table = await self._table(game_id)
+        return table.game if table is not None else None
+
+    def get(self, game_id):
+        return self.call(self._get(game_id))
+
+    async def _attach(self, game_id):
+        table = await self._table(game_id)
+        if table is None:
+            return None
+        session = Session()
+        table.sessions.add(session)
+        return session
+
+    def attach(self, game_id):
+        """Keep ``game_id``'s table open while the caller holds the returned token.
+
+        The hub only holds the token weakly, so a session that keeps it in its
+        own state stops counting once the session is discarded. Returns None
+        for an unknown game.
+        """
+        return self.call(self._attach(game_id))
+
+    async def _close(self, game_id):
+        table = self.tables.pop(game_id, None)
+        if table is not None:
+            table.changed.set() # Let anyone still waiting see the end
+
+    def close(self, game_id):
+        self.call(self._close(game_id))
+
+    # --- Turns ---
+    @contextmanager
+    def lock(self, game_id):
+        """Hold ``game_id``'s table lock in this thread; a no-op for an unknown game."""
+        table = self.call(self._table(game_id))
+        if table is None:
+            yield
+            return
+        self.call(table.lock.acquire())
+        try:
+            yield
+        finally:
+            self.loop.call_soon_threadsafe(table.lock.release)
+
+    def _publish(self, game_id, version):
+        table = self.tables.get(game_id)
+        if table is None or version == table.version:
+            return
+        table.version = version
+        table.touched = time.monotonic()
+        changed, table.changed = table.changed, asyncio.Event()
+        changed.set()
+
+    def publish(self, game_id, version):
+        """Tell ``game_id``'s subscribers the game is now at ``version``. Does not block."""
+        self.loop.call_soon_threadsafe(self._publish, game_id, version)
+
+    async def _wait(self, game_id, seen, timeout):
+        table = await self._table(game_id)
+        if table is None or table.version != seen:
+            return table.version if table is not None else None
+        table.waiters += 1
+        try:
+            await asyncio.wait_for(table.changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            table.waiters -= 1
+            table.touched = time.monotonic()
+        return table.version if game_id in self.tables else None
+
+    def wait(self, game_id, seen, timeout=WAIT_SECONDS):
+        """Block until ``game_id`` moves past version ``seen`` or ``timeout`` passes; returns the version.
+
+        Returns None once the table is closed.
+        """
+        return self.call(self._wait(game_id, seen, timeout))
+
+    async def subscribe(self, game_id, seen=None):
+        """Yield each new version of ``game_id`` until its table closes. Runs on the hub's loop."""
+        table = self.tables.get(game_id)
+        if table is None:
+            return
+        seen = table.version if seen is None else seen
+        table.waiters += 1
+        try:
+            while game_id in self.tables:
+                if table.version != seen:
+                    seen = table.version
+                    yield seen
+                    continue
+                await table.changed.wait()
+        finally:
+            table.waiters -= 1
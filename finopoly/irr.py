@@ -0,0 +1,113 @@
+"""Batched internal rate of return.
+
+A schedule is a row of cash flows ``c[0], c[1], ..., c[T]`` at the end of
+years ``0..T`` (``c[0]`` is usually ``-cost``); shorter schedules are padded
+with zeros. ``irr`` solves ``sum(c[t] * v ** t) == 0`` in the discount factor
+``v = 1 / (1 + r)`` for every row at once with safeguarded Newton steps: each
+row keeps a sign-change bracket and falls back to bisection whenever Newton
+leaves it or stalls. In ``v`` the NPV is a polynomial, convex for the usual
+pay-then-earn schedules, so Newton rarely needs the fallback.
+"""
+import numpy as np
+
+LOW_RATE = -0.99
+HIGH_RATE = 10.0
+BLOCK_ROWS = 16384
+
+
+def _npv_and_slope(columns, v):
+    """NPV and dNPV/dv at discount factor ``v`` via Horner's rule.
+
+    ``columns`` has shape ``(T + 1, n)`` so Horner's rule walks contiguous
+    rows rather than strided columns.
+    """
+    value = columns[-1].copy()
+    slope = np.zeros_like(value)
+    for t in range(columns.shape[0] - 2, -1, -1):
+        slope *= v
+        slope += value
+        value *= v
+        value += columns[t]
+    return value, slope
+
+
+def irr(schedules, guess=0.10, tol=1e-10, max_iter=100, low=LOW_RATE, high=HIGH_RATE):
+    """IRR of each row of ``schedules`` (shape ``(n, T + 1)`` or ``(T + 1,)``).
+
+    Rows whose NPV does not change sign on ``[low, high]`` have no IRR there
+    and come back as NaN. Every row starts from ``guess``; iteration stops
+    per row once the rate moves less than ``tol`` or after ``max_iter``
+    passes.
+    """
+    schedules = np.asarray(schedules, dtype=np.float64)
+    single = schedules.ndim == 1
+    schedules = np.atleast_2d(schedules)
+    result = np.empty(schedules.shape[0])
+    # Solve in blocks small enough that the working arrays stay in cache.
+    for start in range(0, schedules.shape[0], BLOCK_ROWS):
+        block = schedules[start:start + BLOCK_ROWS]
+        result[start:start + BLOCK_ROWS] = _irr_block(np.ascontiguousarray(block.T), guess, tol, max_iter, low, high)
+    return result[0] if single else result
+
+
+def _irr_block(columns, guess, tol, max_iter, low, high):
+    n = columns.shape[1]
+    v_low, v_high = 1.0 / (1.0 + high), 1.0 / (1.0 + low)
+
+    f_low, _ = _npv_and_slope(columns, v_low)
+    f_high, _ = _npv_and_slope(columns, v_high)
+    result = np.full(n, np.nan)
+    result[f_high == 0] = low
+    result[f_low == 0] = high
+    active = np.flatnonzero(np.sign(f_low) * np.sign(f_high) < 0)
+
+    # Orient every bracket so that NPV(a) < 0 < NPV(b).
+    negative_low = f_low[active] < 0
+    a = np.where(negative_low, v_low, v_high)
+    b = np.where(negative_low, v_high, v_low)
+    v = np.full(active.size, 1.0 / (1.0 + min(max(float(guess), low), high)))
+    columns = columns[:, active]
+
+    for _ in range(max_iter):
+        if not active.size:
+            break
+        value, slope = _npv_and_slope(columns, v)
+        negative = value < 0
+        a = np.where(negative, v, a)
+        b = np.where(negative, b, v)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = value / slope
+        newton = v - step
+        # |dr| = |dv| / v**2 for r = 1/v - 1. A Newton step already within
+        # tolerance is taken even if rounding puts it on the bracket edge.
+        tiny = np.abs(step) <= tol * v * v
+        inside = tiny | ((newton - a) * (newton - b) < 0)
+        new_v = np.where(inside, newton, 0.5 * (a + b))
+        new_v = np.where(value == 0, v, new_v)
+
+        done = np.abs(new_v - v) <= tol * new_v * v
+        if done.any():
+            result[active[done]] = 1.0 / new_v[done] - 1.0
+            keep = ~done
+            active, columns = active[keep], columns[:, keep]
+            new_v, a, b = new_v[keep], a[keep], b[keep]
+        v = new_v
+
+    # Rows still iterating at the cap report their best estimate.
+    result[active] = 1.0 / v - 1.0
+    return result
+
+
+def pad_schedules(schedules):
+    """Stack ragged cash-flow lists into a zero-padded 2-D array."""
+    width = max((len(s) for s in schedules), default=1)
+    out = np.zeros((len(schedules), width))
+    for i, schedule in enumerate(schedules):
+        out[i, :len(schedule)] = schedule
+    return out
+
+
+def project_irrs(projects):
+    """IRR of each ``Project``'s current cash-flow schedule in one solve."""
+    return irr(pad_schedules([p.cash_flow_schedule() for p in projects]))
@@ -0,0 +1,150 @@
+"""Exact landing probabilities for a board layout.
+
+A player's movement is a Markov chain: each turn ``move_player`` advances by
+a fair d6 modulo the board length. The only thing that changes movement is
+System Crash, which the Event tile draws with probability 1/8 and which makes
+the player sit out their next turn. So the chain's state is
+``(position, skip_next_turn)``, and the distribution after ``r`` turns is the
+start vector times the ``r``-th power of the transition matrix. Results are
+cached per layout, so repeat queries cost a dictionary lookup. Callers that
+see each layout once, like the board search, use ``turn_powers`` and
+``reach_from`` instead, which cache nothing.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+DICE_FACES = 6
+# One System Crash among the eight events in create_events.
+CRASH_PROBABILITY = 1 / 8
+TILE_LABELS = ("Investment", "Financing", "Event", "Neutral", "IPO", "Strategy")
+TURN_POWERS_CACHE = 32 # Layouts kept; each holds num_rounds 40x40 matrices, 64 KB at 5 rounds
+
+
+def layout_of(board):
+    """Hashable layout of an engine board: one label per tile.
+
+    Special tiles are labelled by their action ("IPO" or "Strategy").
+    """
+    return tuple(tile.action if tile.tile_type == "Special" else tile.tile_type for tile in board)
+
+
+@lru_cache(maxsize=None)
+def move_matrix(size):
+    """``M[p, q]``: probability that one roll from ``p`` lands on ``q``, read-only."""
+    matrix = np.zeros((size, size))
+    for position in range(size):
+        for face in range(1, DICE_FACES + 1):
+            matrix[position, (position + face) % size] += 1 / DICE_FACES
+    matrix.flags.writeable = False
+    return matrix
+
+
+def transition_matrix(layout, crash_probability=CRASH_PROBABILITY):
+    """One-turn transition matrix over ``(position, skip)`` states.
+
+    State ``p`` is "on tile p, moves next turn"; state ``size + p`` is "on
+    tile p, sits out next turn".
+    """
+    size = len(layout)
+    move = move_matrix(size)
+    crash = np.array([crash_probability if label == "Event" else 0.0 for label in layout])
+    matrix = np.zeros((2 * size, 2 * size))
+    matrix[:size, :size] = move * (1 - crash)
+    matrix[:size, size:] = move * crash
+    matrix[size:, :size] = np.eye(size)
+    return matrix
+
+
+def turn_powers(layout, num_rounds, crash_probability=CRASH_PROBABILITY):
+    """``T**0 .. T**(num_rounds - 1)`` for a layout, read-only and not cached."""
+    matrix = transition_matrix(layout, crash_probability)
+    powers = np.empty((num_rounds,) + matrix.shape)
+    powers[0] = np.eye(matrix.shape[0])
+    for r in range(1, num_rounds):
+        powers[r] = powers[r - 1] @ matrix
+    powers.flags.writeable = False
+    return powers
+
+
+@lru_cache(maxsize=TURN_POWERS_CACHE)
+def _turn_powers(layout, num_rounds, crash_probability):
+    return turn_powers(layout, num_rounds, crash_probability)
+
+
+@lru_cache(maxsize=4096)
+def _landing(layout, num_rounds, start, crash_probability):
+    size = len(layout)
+    powers = _turn_powers(layout, num_rounds, crash_probability)
+    # Only players in a "moves next turn" state roll and land.
+    before = powers[:, start, :size]
+    landing = before @ move_matrix(size)
+    landing.flags.writeable = False
+    return landing
+
+
+class LandingDistribution:
+    """Per-round landing probabilities for one seat on one layout.
+
+    ``per_tile[r, p]`` is the probability of landing on tile ``p`` during
+    round ``r + 1``; ``by_type`` sums those over tiles with the same label.
+    """
+
+    def __init__(self, layout, per_tile):
+        self.layout = layout
+        self.per_tile = per_tile
+        labels = np.array(layout)
+        self.by_type = {label: per_tile[:, labels == label].sum(axis=1) for label in TILE_LABELS}
+        for values in self.by_type.values():
+            values.flags.writeable = False
+
+    def expected_landings(self):
+        """Expected number of landings on each tile over the whole game."""
+        return self.per_tile.sum(axis=0)
+
+    def probability_of_reaching(self, tile, first_round=1):
+        """Probability of landing on ``tile`` at least once from ``first_round`` on.
+
+        Landing on a tile and landing on it again are not independent, so
+        this walks the chain with ``tile`` made absorbing.
+        """
+        return reach_probability(self.layout, tile, len(self.per_tile), first_round)
+
+
+def landing_distribution(board, num_rounds=5, start=0, crash_probability=CRASH_PROBABILITY):
+    """Exact ``LandingDistribution`` for an engine board or a layout tuple.
+
+    The returned object is shared between callers asking about the same
+    layout and must not be modified.
+    """
+    layout = board if isinstance(board, tuple) else layout_of(board)
+    return _distribution(layout, num_rounds, start, crash_probability)
+
+
+@lru_cache(maxsize=4096)
+def _distribution(layout, num_rounds, start, crash_probability):
+    return LandingDistribution(layout, _landing(layout, num_rounds, start, crash_probability))
+
+
+@lru_cache(maxsize=65536)
+def reach_probability(layout, tile, num_rounds=5, first_round=1, start=0, crash_probability=CRASH_PROBABILITY):
+    """Probability of landing on ``tile`` in some round ``first_round..num_rounds``."""
+    powers = _turn_powers(layout, num_rounds, crash_probability)
+    return reach_from(powers, layout, tile, first_round, start, crash_probability)
+
+
+def reach_from(powers, layout, tile, first_round=1, start=0, crash_probability=CRASH_PROBABILITY):
+    """``reach_probability`` given ``turn_powers(layout, num_rounds)``; caches nothing."""
+    size = len(layout)
+    num_rounds = len(powers)
+    move = move_matrix(size)
+    crash = np.array([crash_probability if label == "Event" else 0.0 for label in layout])
+    state = powers[first_round - 1, start].copy()
+    reached = 0.0
+    for _ in range(first_round - 1, num_rounds):
+        # Take out the mass that lands on the tile, then advance the rest.
+        moving = state[:size] @ move
+        reached += moving[tile]
+        moving[tile] = 0.0
+        state = np.concatenate([moving * (1 - crash) + state[size:], moving * crash])
+    return reached
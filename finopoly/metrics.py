@@ -0,0 +1,211 @@
+"""Opt-in timers, counters and a sampling profiler for the app's hot paths.
+
+Everything is switched on by environment variables read at import:
+
+* ``FINOPOLY_METRICS=path`` records metrics and writes them to ``path`` at
+  most every ``FLUSH_SECONDS``. The output is Prometheus text, or JSON if
+  the path ends in ``.json``. Point a node-exporter textfile collector at a
+  ``.prom`` file, or serve the JSON as it is.
+* ``FINOPOLY_PROFILE=directory`` also samples the stack of every call
+  timed with ``profile=True``. It keeps the ``SLOWEST`` slowest calls as folded-stack
+  files (``flamegraph.pl``/speedscope input).
+
+With metrics off, ``timed`` returns the function it wraps unchanged, and
+``count`` and ``flush`` are empty functions. The only cost left is one call
+per counter.
+"""
+import atexit
+import functools
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+PATH = os.environ.get("FINOPOLY_METRICS")
+PROFILE_DIR = os.environ.get("FINOPOLY_PROFILE")
+ENABLED = bool(PATH or PROFILE_DIR)
+FLUSH_SECONDS = 5.0
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0) # seconds
+SAMPLE_SECONDS = 0.002
+SLOWEST = 10
+
+
+# --- Registry ---
+class Timer:
+    """A Prometheus histogram of durations in seconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def cumulative(self):
+        running = 0
+        for bound, hits in zip(BUCKETS, self.buckets):
+            running += hits
+            yield bound, running
+
+
+class Registry:
+    """Counters and timers by name. Streamlit sessions share one per process."""
+
+    def __init__(self):
+        self.counters = Counter()
+        self.timers = {}
+        self.lock = threading.Lock()
+        self.flushed = 0.0
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] += n
+
+    def observe(self, name, seconds):
+        with self.lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = Timer()
+            timer.observe(seconds)
+
+    def to_prometheus(self):
+        lines = ["# TYPE finopoly_events_total counter"]
+        with self.lock:
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'finopoly_events_total{{name="{name}"}} {value}')
+            lines.append("# TYPE finopoly_seconds histogram")
+            for name, timer in sorted(self.timers.items()):
+                for bound, hits in timer.cumulative():
+                    lines.append(f'finopoly_seconds_bucket{{name="{name}",le="{bound}"}} {hits}')
+                lines.append(f'finopoly_seconds_bucket{{name="{name}",le="+Inf"}} {timer.count}')
+                lines.append(f'finopoly_seconds_sum{{name="{name}"}} {timer.total:.6f}')
+                lines.append(f'finopoly_seconds_count{{name="{name}"}} {timer.count}')
+        return "\n".join(lines) + "\n"
+
+    def to_json(self):
+        with self.lock:
+            timers = {name: {"count": timer.count, "sum": timer.total,
+                             "buckets": dict(zip(map(str, BUCKETS), timer.buckets))}
+                      for name, timer in self.timers.items()}
+            return json.dumps({"counters": dict(self.counters), "timers": timers}, indent=2)
+
+    def write(self, path):
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            f.write(text)
+        os.replace(temporary, path) # Readers never see a half-written file
+
+    def flush(self, path=None, force=False):
+        """Write to ``path`` (default ``FINOPOLY_METRICS``) if ``FLUSH_SECONDS`` have passed."""
+        path = path or PATH
+        now = time.monotonic()
+        if path is None or (not force and now - self.flushed < FLUSH_SECONDS):
+            return
+        self.flushed = now
+        self.write(path)
+
+
+registry = Registry()
+
+
+# --- Profiler ---
+class SamplingProfiler:
+    """Samples one thread's stack while a call runs, and keeps the slowest calls' stacks."""
+
+    def __init__(self, directory, interval=SAMPLE_SECONDS, keep=SLOWEST):
+        self.directory = directory
+        self.interval = interval
+        self.keep = keep
+        self.slowest = [] # Min-heap of (seconds, sequence, file name)
+        self.sequence = 0
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def sample(self, thread_id, stacks, stop):
+        while not stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if names and not stop.is_set(): # The call may have returned meanwhile
+                stacks[";".join(reversed(names))] += 1
+
+    @contextmanager
+    def profile(self, name):
+        stacks = Counter()
+        stop = threading.Event()
+        sampler = threading.Thread(target=self.sample, args=(threading.get_ident(), stacks, stop), daemon=True)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            sampler.join()
+            self.record(name, time.perf_counter() - start, stacks)
+
+    def record(self, name, seconds, stacks):
+        if not stacks:
+            return
+        with self.lock:
+            if len(self.slowest) >= self.keep and seconds <= self.slowest[0][0]:
+                return
+            self.sequence += 1
+            file_name = f"{name}-{self.sequence}-{seconds * 1000:.0f}ms.folded"
+            heapq.heappush(self.slowest, (seconds, self.sequence, file_name))
+            dropped = heapq.heappop(self.slowest)[2] if len(self.slowest) > self.keep else None
+        with open(os.path.join(self.directory, file_name), "w") as f:
+            f.writelines(f"{stack} {samples}\n" for stack, samples in stacks.items())
+        if dropped is not None:
+            os.remove(os.path.join(self.directory, dropped))
+
+
+profiler = SamplingProfiler(PROFILE_DIR) if PROFILE_DIR else None
+
+
+# --- Instrumentation ---
+def _timed(name, profile=False):
+    """Record each call's duration as timer ``name``; with ``profile``, sample its stack too."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                if profile and profiler is not None:
+                    with profiler.profile(name):
+                        return func(*args, **kwargs)
+                return func(*args, **kwargs)
+            finally:
+                # Also runs when st.rerun() ends the call early.
+                registry.observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def _untimed(name, profile=False):
+    """Metrics are off: leave the function as it is."""
+    return lambda func: func
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+timed = _timed if ENABLED else _untimed
+count = registry.count if ENABLED else _noop
+flush = registry.flush if ENABLED else _noop
+if PATH:
+    atexit.register(registry.flush, force=True)
@@ -0,0 +1,200 @@
+"""Checkpoint games to SQLite so they survive a server restart.
+
+A checkpoint is a game's ``TurnLog`` bytes, about a hundred bytes for a
+whole game, upserted into one row per game id (the primary key gives the
+indexed lookup). ``GameStore.save`` only queues the bytes. A background
+writer coalesces the queue by game id and writes it in one transaction
+every ``flush_interval`` seconds, so a turn never waits on the disk.
+Restoring reads the row and replays the log, see ``finopoly.replay.resume``.
+
+A batch that fails to write goes back on the queue, unless a newer
+checkpoint for the same game arrived meanwhile, and the writer logs the
+error and retries on its next interval. ``close`` makes a last attempt and
+returns the ids of games whose latest checkpoint never reached the disk.
+
+The database runs in WAL mode so readers never block the writer.
+Connections come from a small pool per process; a forked worker gets its
+own pool rather than sharing its parent's handles.
+"""
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from .turnlog import TurnLog
+
+DEFAULT_DB = "finopoly.sqlite3"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    turns INTEGER NOT NULL,
+    updated REAL NOT NULL,
+    log BLOB NOT NULL
+)
+"""
+UPSERT = """
+INSERT INTO games (game_id, turns, updated, log) VALUES (?, ?, ?, ?)
+ON CONFLICT(game_id) DO UPDATE SET turns = excluded.turns, updated = excluded.updated, log = excluded.log
+WHERE excluded.turns >= games.turns
+"""
+
+log = logging.getLogger(__name__)
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """A fixed set of WAL-mode connections to one database file."""
+
+    def __init__(self, path, size=4):
+        self.path = path
+        self.idle = queue.LifoQueue()
+        for _ in range(size):
+            self.idle.put(self._connect())
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(SCHEMA)
+        return connection
+
+    def acquire(self):
+        return self.idle.get()
+
+    def release(self, connection):
+        self.idle.put(connection)
+
+    def close(self):
+        while not self.idle.empty():
+            self.idle.get_nowait().close()
+
+
+def pool_for(path, size=4):
+    """The calling process's pool for ``path``, created on first use."""
+    key = (os.getpid(), os.path.abspath(path))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(path, size)
+        return pool
+
+
+class GameStore:
+    """Queued, batched checkpoints of turn logs keyed by game id."""
+
+    def __init__(self, path=DEFAULT_DB, pool_size=4, flush_interval=0.05):
+        self.pool = pool_for(path, pool_size)
+        self.flush_interval = flush_interval
+        self.pending = {}
+        self.lock = threading.Lock()
+        # Held from taking a batch until it is committed, so batches land in order.
+        self.write_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.writes = 0
+        self.batches = 0
+        self.closed = False
+        self.writer = threading.Thread(target=self._run, name="finopoly-checkpoints", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def save(self, game_id, log):
+        """Queue a checkpoint; a newer one for the same game replaces it."""
+        blob = log.to_bytes()
+        with self.lock:
+            self.pending[game_id] = (len(log), time.time(), blob)
+
+    def _take(self):
+        with self.lock:
+            batch, self.pending = self.pending, {}
+        return batch
+
+    def _requeue(self, batch):
+        # Put back what failed to write; a checkpoint saved since is newer and wins.
+        with self.lock:
+            for game_id, checkpoint in batch.items():
+                self.pending.setdefault(game_id, checkpoint)
+
+    def _write(self, batch):
+        connection = self.pool.acquire()
+        try:
+            connection.execute("BEGIN")
+            connection.executemany(UPSERT, [(game_id, turns, updated, blob) for game_id, (turns, updated, blob) in batch.items()])
+            connection.execute("COMMIT")
+        except Exception:
+            try:
+                connection.execute("ROLLBACK")
+            except sqlite3.Error:
+                log.exception("Rolling back a failed checkpoint batch failed")
+            raise # The original error, so flush requeues the batch
+        finally:
+            self.pool.release(connection)
+        self.writes += len(batch)
+        self.batches += 1
+
+    def _run(self):
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                log.exception("Writing checkpoints failed; retrying in %.2f s", self.flush_interval)
+
+    def flush(self):
+        """Write everything queued so far before returning.
+
+        On failure the batch is queued again and the error is raised.
+        """
+        with self.write_lock:
+            batch = self._take()
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception:
+                    self._requeue(batch)
+                    raise
+
+    def load(self, game_id):
+        """The latest ``TurnLog`` for ``game_id``, or ``None``."""
+        # A batch in flight is in neither place, so wait for it to commit.
+        with self.write_lock:
+            with self.lock:
+                queued = self.pending.get(game_id)
+            if queued is not None:
+                return TurnLog.from_bytes(queued[2])
+            connection = self.pool.acquire()
+            try:
+                row = connection.execute("SELECT log FROM games WHERE game_id = ?", (game_id,)).fetchone()
+            finally:
+                self.pool.release(connection)
+        return TurnLog.from_bytes(row[0]) if row is not None else None
+
+    def delete(self, game_id):
+        with self.lock:
+            self.pending.pop(game_id, None)
+        connection = self.pool.acquire()
+        try:
+            connection.execute("DELETE FROM games WHERE game_id = ?", (game_id,))
+        finally:
+            self.pool.release(connection)
+
+    def close(self):
+        """Stop the writer and flush; returns the game ids left unwritten."""
+        if self.closed:
+            return []
+        self.closed = True
+        self.wake.set()
+        self.writer.join()
+        try:
+            self.flush()
+        except Exception:
+            log.exception("Writing checkpoints failed on close")
+        with self.lock:
+            unwritten = sorted(self.pending)
+        if unwritten:
+            log.error("%d checkpoint(s) never written: %s", len(unwritten), ", ".join(unwritten))
+        return unwritten
@@ -0,0 +1,180 @@
+"""Financing and investment strategies to compare in tournaments.
+
+Every class here is a ``Policy`` registered by name in ``POLICIES``, and
+``load_policy`` also accepts any other ``Policy`` subclass as a
+``module:Class`` path. ``finopoly.tournament`` loads them by name in its
+worker processes.
+
+The fixed strategies each try one idea: always borrow, take VC money
+early, go public in round 4, buy only low-risk projects. ``ScorePolicy``
+prices every move by what it adds to the ``end_game`` score. It counts
+interest as ``pay_debt_interest`` charges it, dilution as
+``add_financing`` records it, and NPV as ``final_scores`` values it,
+after the last round.
+"""
+import importlib
+
+from .catalog import BOARD_SIZE, TILE_COUNTS
+from .engine import (
+    CASH_WEIGHT,
+    DEBT_INTEREST,
+    EQUITY_DILUTION,
+    EXPAND_COST,
+    EXPAND_FACTOR,
+    IPO_BONUS,
+    NPV_WEIGHT,
+    PIVOT_COST,
+    PIVOT_EXTRA_LIFE,
+    PIVOT_FACTOR,
+    PROJECT_BONUS,
+    SALE_RECOVERY,
+    STRATEGIC_WEIGHT,
+    USERS_WEIGHT,
+    VC_DILUTION,
+    GreedyPolicy,
+    Policy,
+    RandomPolicy,
+)
+from .valuation import DEFAULT_RATE, IPO_NPV_FACTOR, annuity_factor
+
+# Chance that a move ends on a Neutral tile, where revenue is collected.
+NEUTRAL_SHARE = TILE_COUNTS["Neutral"] / BOARD_SIZE
+
+
+def find_option(options, name):
+    return next((option for option in options if option.name == name), None)
+
+
+# --- Fixed strategies ---
+class AlwaysDebtPolicy(GreedyPolicy):
+    """Buys positive-NPV projects and borrows the maximum at every Financing tile."""
+
+    def choose_financing(self, game, player, options):
+        debt = find_option(options, "Debt")
+        return (debt, debt.max_amount) if debt is not None else None
+
+
+class EarlyVCPolicy(GreedyPolicy):
+    """Buys positive-NPV projects and takes VC funding if offered in the first rounds."""
+
+    early_rounds = 2
+
+    def choose_financing(self, game, player, options):
+        vc = find_option(options, "VC Funding")
+        if vc is None or game.current_round > self.early_rounds:
+            return None
+        return vc, vc.max_amount
+
+
+class IPORound4Policy(GreedyPolicy):
+    """Buys positive-NPV projects and goes public in round 4, from either tile."""
+
+    ipo_round = 4
+
+    def choose_ipo(self, game, player):
+        return game.current_round == self.ipo_round
+
+    def choose_financing(self, game, player, options):
+        ipo = find_option(options, "IPO")
+        if ipo is None or player.ipo_done or game.current_round != self.ipo_round:
+            return None
+        return ipo, ipo.max_amount
+
+
+class LowRiskPolicy(Policy):
+    """Buys only low-risk, positive-NPV projects and never raises money."""
+
+    def choose_investment(self, game, player, project):
+        return project.risk_level == "Low" and project.calculate_npv() > 0
+
+
+# --- Score-driven strategy ---
+class ScorePolicy(Policy):
+    """Makes every move that raises its expected ``end_game`` score."""
+
+    def final_round(self, game):
+        # final_scores runs after the last round has advanced.
+        return game.num_rounds + 1
+
+    def npv_factor(self, player):
+        return (1 - player.equity_dilution) * (IPO_NPV_FACTOR if player.ipo_done else 1)
+
+    def cash_flow_value(self, game, player, cash_flow, expiry):
+        """Score from ``cash_flow`` a year until round ``expiry``: end NPV plus expected collections."""
+        years = expiry - self.final_round(game)
+        npv = cash_flow * annuity_factor(DEFAULT_RATE, years) * self.npv_factor(player)
+        collections = NEUTRAL_SHARE * (game.num_rounds - game.current_round)
+        return NPV_WEIGHT * npv + CASH_WEIGHT * cash_flow * collections
+
+    def base_npv(self, game, player):
+        """End-of-game NPV of what the player owns, before dilution and IPO."""
+        end = self.final_round(game)
+        return sum(cash_flow * annuity_factor(DEFAULT_RATE, expiry - end)
+                   for expiry, cash_flow in player.cash_flow_by_expiry.items())
+
+    def choose_investment(self, game, player, project):
+        gain = self.cash_flow_value(game, player, project.annual_cash_flow, game.current_round + project.life)
+        gain += USERS_WEIGHT * project.user_gain + STRATEGIC_WEIGHT * PROJECT_BONUS
+        return gain > CASH_WEIGHT * project.cost
+
+    def financing_value(self, game, player, option):
+        base = self.base_npv(game, player)
+        ipo = IPO_NPV_FACTOR if player.ipo_done else 1
+        if option.name == "Debt":
+            interest_rounds = game.num_rounds - game.current_round + 1
+            return CASH_WEIGHT * option.max_amount * (1 - DEBT_INTEREST * interest_rounds)
+        if option.name == "VC Funding":
+            return CASH_WEIGHT * option.max_amount - NPV_WEIGHT * base * VC_DILUTION * ipo
+        if option.name == "Equity":
+            return CASH_WEIGHT * option.max_amount - NPV_WEIGHT * base * EQUITY_DILUTION * ipo
+        if option.name == "IPO":
+            lost = base * (1 - player.equity_dilution) * (1 - IPO_NPV_FACTOR)
+            return CASH_WEIGHT * option.max_amount + STRATEGIC_WEIGHT * IPO_BONUS - NPV_WEIGHT * lost
+        return 0
+
+    def choose_financing(self, game, player, options):
+        value, option = max(((self.financing_value(game, player, o), o) for o in options), key=lambda pair: pair[0])
+        return (option, option.max_amount) if value > 0 else None
+
+    def choose_ipo(self, game, player):
+        ipo = find_option(game.financing_options, "IPO")
+        return self.financing_value(game, player, ipo) > 0
+
+    def choose_strategy(self, game, player):
+        best_value, best = 0, None
+        for project in player.projects:
+            cash_flow = project.annual_cash_flow
+            expiry = project.purchase_round + project.life
+            current = self.cash_flow_value(game, player, cash_flow, expiry)
+            moves = [(CASH_WEIGHT * project.cost * SALE_RECOVERY - current - STRATEGIC_WEIGHT * PROJECT_BONUS, "Sell")]
+            if player.can_afford(EXPAND_COST):
+                expanded = self.cash_flow_value(game, player, cash_flow * EXPAND_FACTOR, expiry)
+                moves.append((expanded - current - CASH_WEIGHT * EXPAND_COST, "Expand"))
+            if player.can_afford(PIVOT_COST):
+                pivoted = self.cash_flow_value(game, player, cash_flow * PIVOT_FACTOR, expiry + PIVOT_EXTRA_LIFE)
+                moves.append((pivoted - current - CASH_WEIGHT * PIVOT_COST, "Pivot"))
+            for value, action in moves:
+                if value > best_value:
+                    best_value, best = value, (project, action)
+        return best
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "greedy": GreedyPolicy,
+    "always-debt": AlwaysDebtPolicy,
+    "early-vc": EarlyVCPolicy,
+    "ipo-round-4": IPORound4Policy,
+    "low-risk": LowRiskPolicy,
+    "score": ScorePolicy,
+}
+
+
+def load_policy(name):
+    """A new policy from a ``POLICIES`` name or a ``module:Class`` path."""
+    if name in POLICIES:
+        return POLICIES[name]()
+    module, _, attribute = name.partition(":")
+    if not attribute:
+        raise ValueError(f"Unknown policy {name!r}: use one of {', '.join(POLICIES)} or module:Class")
+    return getattr(importlib.import_module(module), attribute)()
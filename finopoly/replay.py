@@ -0,0 +1,162 @@
+"""Rebuild any turn of a logged game.
+
+``ReplayEngine`` is a ``FinopolyEngine`` whose dice, event draws and player
+decisions come from a ``TurnLog`` instead of an RNG and policies, so it
+follows the recorded game exactly through the normal rule code. ``Replay``
+keeps a state snapshot every ``snapshot_every`` turns and answers
+``state_at(turn)`` by restoring the nearest earlier snapshot and replaying
+only the turns after it.
+"""
+import random
+
+from .engine import FinopolyEngine, Policy
+from .turnlog import FINANCE, INVEST, IPO, STRATEGY, STRATEGY_ACTIONS, TurnLog
+
+SNAPSHOT_EVERY = 5
+# Only used to pick the logged layout out of a one-element list.
+_LAYOUT_RNG = random.Random(0)
+
+
+class ReplayPolicy(Policy):
+    """Answers every decision with what the log says happened this turn."""
+
+    def choose_investment(self, game, player, project):
+        return game.outcome[0] == INVEST
+
+    def choose_financing(self, game, player, options):
+        if game.outcome[0] != FINANCE:
+            return None
+        option_index, amount = game.outcome[1]
+        return game.financing_options[option_index], amount
+
+    def choose_ipo(self, game, player):
+        return game.outcome[0] == IPO
+
+    def choose_strategy(self, game, player):
+        if game.outcome[0] != STRATEGY:
+            return None
+        project_index, action = game.outcome[1]
+        return game.projects[project_index], STRATEGY_ACTIONS[action]
+
+
+class ReplayEngine(FinopolyEngine):
+    def __init__(self, log, catalog=None):
+        super().__init__(rng=_LAYOUT_RNG, default_policy=ReplayPolicy(), layouts=[log.positions], catalog=catalog)
+        self.log = None
+        for name in log.names:
+            self.add_player(name)
+        self.roll = 0
+        self.outcome = (None, ())
+
+    def roll_dice(self):
+        return self.roll
+
+    def draw_event(self):
+        return self.events[self.outcome[1][0]]
+
+    def replay_turn(self, roll, kind, args):
+        player = self.players[self.current_player_index]
+        if (roll == 0) != player.skip_next_turn:
+            raise ValueError(f"Turn {self.turn} does not match the log: {player.name} skip={player.skip_next_turn}, roll={roll}")
+        self.roll = roll
+        self.outcome = (kind, args)
+        self.take_turn()
+
+
+def snapshot(game):
+    """Plain-tuple copy of everything that changes during play, for any engine."""
+    seat_of = {id(player): seat for seat, player in enumerate(game.seats)}
+    option_of = {id(option): i for i, option in enumerate(game.financing_options)}
+    project_of = {id(project): i for i, project in enumerate(game.projects)}
+    players = tuple(
+        (p.cash, p.users, p.position, p.debt, p.equity_dilution, p.vc_funding_used, p.ipo_done,
+         p.skip_next_turn, p.next_project_discount,
+         tuple((option_of[id(option)], amount) for option, amount in p.financing_history),
+         tuple(project_of[id(project)] for project in p.projects))
+        for p in game.seats
+    )
+    projects = tuple(
+        (seat_of[id(project.owner)] if project.owner is not None else -1,
+         project.purchase_round, project.annual_cash_flow, project.life, project.adjustments)
+        for project in game.projects
+    )
+    return (game.turn, game.current_round, game.current_player_index, game.game_over,
+            tuple(seat_of[id(player)] for player in game.players), players, projects)
+
+
+def restore(game, state, seats=None):
+    """Put ``state`` from ``snapshot`` into ``game``; ``seats`` defaults to ``game.seats``."""
+    seats = seats if seats is not None else game.seats
+    game.turn, game.current_round, game.current_player_index, game.game_over, remaining, players, projects = state
+    game.players = [seats[seat] for seat in remaining]
+    for player, (cash, users, position, debt, dilution, vc_used, ipo_done, skip, discount, history, owned) in zip(seats, players):
+        player.cash = cash
+        player.users = users
+        player.position = position
+        player.debt = debt
+        player.equity_dilution = dilution
+        player.vc_funding_used = vc_used
+        player.ipo_done = ipo_done
+        player.skip_next_turn = skip
+        player.next_project_discount = discount
+        player.financing_history = [(game.financing_options[i], amount) for i, amount in history]
+        player.projects = [game.projects[i] for i in owned]
+    for project, (owner, purchase_round, cash_flow, life, adjustments) in zip(game.projects, projects):
+        project.owner = seats[owner] if owner >= 0 else None
+        project.purchase_round = purchase_round
+        project.annual_cash_flow = cash_flow
+        project.life = life
+        project.adjustments = adjustments
+    for player in seats:
+        player.rebuild_aggregates()
+        player.expire_projects(game.current_round)
+
+
+class Replay:
+    """Random access to the states of one logged game."""
+
+    def __init__(self, log, snapshot_every=SNAPSHOT_EVERY, catalog=None):
+        self.log = TurnLog.from_bytes(log) if isinstance(log, (bytes, bytearray)) else log
+        self.turns = self.log.turns()
+        self.snapshot_every = snapshot_every
+        self.catalog = catalog
+        self.snapshots = {0: snapshot(ReplayEngine(self.log, catalog))}
+
+    def state_at(self, turn=None):
+        """A fresh ``ReplayEngine`` positioned after ``turn`` turns (default: all)."""
+        turn = len(self.turns) if turn is None else turn
+        if not 0 <= turn <= len(self.turns):
+            raise IndexError(f"Turn {turn} is outside a {len(self.turns)}-turn log")
+        base = turn - turn % self.snapshot_every
+        while base not in self.snapshots:
+            base -= self.snapshot_every
+        game = ReplayEngine(self.log, self.catalog)
+        restore(game, self.snapshots[base])
+        for t in range(base, turn):
+            game.replay_turn(*self.turns[t])
+            if game.turn % self.snapshot_every == 0:
+                self.snapshots.setdefault(game.turn, snapshot(game))
+        return game
+
+
+def replay(log, catalog=None):
+    """Play a whole logged game through in one pass and return the engine."""
+    log = TurnLog.from_bytes(log) if isinstance(log, (bytes, bytearray)) else log
+    game = ReplayEngine(log, catalog)
+    for turn in log.turns():
+        game.replay_turn(*turn)
+    return game
+
+
+def resume(game, log):
+    """Bring a freshly set-up ``game`` to the end of ``log`` and keep logging there.
+
+    ``game`` must be built on ``log.positions`` with ``log.names`` seated in
+    order and no turns played, e.g. ``Finopoly(layouts=[log.positions])``.
+    """
+    if game.board_positions != tuple(log.positions) or [p.name for p in game.players] != log.names:
+        raise ValueError("Game was not set up from this log's layout and players")
+    played = replay(log, game.catalog)
+    restore(game, snapshot(played))
+    game.log = log
+    return game
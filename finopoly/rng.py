@@ -0,0 +1,96 @@
+"""Seeded, block-buffered random streams for games.
+
+``RandomStream`` provides the part of ``random.Random`` that the engine and
+its policies use (``random``, ``randrange``, ``randint``, ``choice`` and
+``shuffle``), so it can be passed as ``FinopolyEngine(rng=...)``. Underneath
+is a NumPy Philox generator keyed by ``(seed key, stream)``. Philox is
+counter-based: every key is an independent stream, and switching key is
+cheap. Game ``i`` of a run seeded ``s`` is ``RandomStream(s, stream=i)`` in
+whichever process plays it, and ``reset(i)`` re-keys an existing stream
+without building a new generator.
+
+Draws come from a block of uniforms that one NumPy call fills, refilled
+when it runs out. A die roll or an event index is one list read and a
+multiply. ``spawn`` hands out independent child streams via
+``SeedSequence.spawn`` for workers that are not indexed by game.
+
+``seed`` is ``(entropy, spawn_key)``. A spawned child shares its parent's
+entropy and differs only by the key, so both are needed to rebuild it;
+``RandomStream(stream.seed, stream.stream)`` replays any stream.
+"""
+import numpy as np
+
+BLOCK = 64 # Uniforms per refill; a whole game usually fits in one block
+
+
+class RandomStream:
+    """One game's random draws, reproducible from ``seed`` and ``stream``."""
+
+    def __init__(self, seed=None, stream=0, block=BLOCK):
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        elif isinstance(seed, tuple) and len(seed) == 2 and isinstance(seed[1], tuple):
+            self.seed_sequence = np.random.SeedSequence(seed[0], spawn_key=seed[1])
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        # Pass back as ``seed`` to replay the stream
+        self.seed = (self.seed_sequence.entropy, tuple(self.seed_sequence.spawn_key))
+        self.block = block
+        key = int(self.seed_sequence.generate_state(1, np.uint64)[0])
+        self.bit_generator = np.random.Philox(key=[key, stream])
+        self.generator = np.random.Generator(self.bit_generator)
+        self._start = self.bit_generator.state # Reused by reset; the setter copies it
+        self.stream = stream
+        self._draws = iter(())
+
+    def reset(self, stream):
+        """Rewind to the start of ``stream`` under the same seed; returns ``self``."""
+        self._start["state"]["key"][1] = stream
+        self.bit_generator.state = self._start
+        self.stream = stream
+        self._draws = iter(())
+        return self
+
+    def spawn(self, n):
+        """``n`` independent streams, e.g. one per worker process."""
+        return [RandomStream(child, block=self.block) for child in self.seed_sequence.spawn(n)]
+
+    def _refill(self):
+        self._draws = iter(self.generator.random(self.block).tolist())
+        return next(self._draws)
+
+    # Each draw reads the block inline; these sit on the per-turn path.
+    def random(self):
+        """A float in [0, 1)."""
+        try:
+            return next(self._draws)
+        except StopIteration:
+            return self._refill()
+
+    def randrange(self, start, stop=None):
+        if stop is None:
+            start, stop = 0, start
+        if stop <= start:
+            raise ValueError(f"Empty range for randrange({start}, {stop})")
+        try:
+            u = next(self._draws)
+        except StopIteration:
+            u = self._refill()
+        return start + int(u * (stop - start))
+
+    def randint(self, a, b):
+        return self.randrange(a, b + 1)
+
+    def choice(self, seq):
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        try:
+            u = next(self._draws)
+        except StopIteration:
+            u = self._refill()
+        return seq[int(u * len(seq))]
+
+    def shuffle(self, x):
+        for i in range(len(x) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            x[i], x[j] = x[j], x[i]
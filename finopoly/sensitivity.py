@@ -0,0 +1,65 @@
+"""Catalog-wide sensitivity of project value to rate, cash-flow shocks and strategy.
+
+``evaluate`` values every catalog project on every cell of a
+``rates x shocks x actions`` grid in one broadcast through
+``valuation.annuity_factors``. It returns ``(projects, rates, shocks,
+actions)`` arrays of NPV, profitability index and payback period:
+
+* a shock scales the annual cash flow by ``1 + shock``. The catalog's
+  Economic Downturn is -0.15, see ``revenue_shocks``;
+* an action is ``(name, cash-flow factor, extra years, extra cost)``, for a
+  Strategy move made when the project is bought. Expand and Pivot take the
+  engine's factors and costs, so ``Hold`` is the project as listed;
+* payback is ``Project.calculate_payback_period``'s undiscounted
+  ``cost / cash flow``, infinite when the cash flow is not positive.
+
+The analysis page caches the result per grid, so its sliders only index
+into these arrays.
+"""
+import numpy as np
+
+from .engine import EXPAND_COST, EXPAND_FACTOR, PIVOT_COST, PIVOT_EXTRA_LIFE, PIVOT_FACTOR
+from .events import REVENUE
+from .valuation import annuity_factors
+
+ACTIONS = (
+    ("Hold", 1.0, 0, 0),
+    ("Expand", EXPAND_FACTOR, 0, EXPAND_COST),
+    ("Pivot", PIVOT_FACTOR, PIVOT_EXTRA_LIFE, PIVOT_COST),
+)
+
+
+def revenue_shocks(catalog):
+    """``{event name: shock}`` for the catalog's events that take a share of revenue."""
+    return {event.name: event.impact.magnitude for event in catalog.events
+            if event.impact.field == "cash" and event.impact.per == REVENUE}
+
+
+def evaluate(projects, rates, shocks, actions=ACTIONS):
+    """NPV, profitability index and payback for every ``ProjectSpec`` on the grid.
+
+    Returns a dict of ``names``, the grid axes and three float arrays of
+    shape ``(len(projects), len(rates), len(shocks), len(actions))``.
+    """
+    cost = np.array([p.cost for p in projects], dtype=np.float64)[:, None, None, None]
+    cash_flow = np.array([p.annual_cash_flow for p in projects], dtype=np.float64)[:, None, None, None]
+    life = np.array([p.life for p in projects], dtype=np.float64)[:, None, None, None]
+    rates = np.asarray(rates, dtype=np.float64)
+    shocks = np.asarray(shocks, dtype=np.float64)
+    factor, extra_life, extra_cost = (np.array([a[i] for a in actions], dtype=np.float64) for i in (1, 2, 3))
+
+    flows = cash_flow * (1 + shocks[None, None, :, None]) * factor # (P, 1, S, A)
+    outlay = cost + extra_cost # (P, 1, 1, A)
+    present = flows * annuity_factors(rates[None, :, None, None], life + extra_life) # (P, R, S, A)
+    with np.errstate(divide="ignore"):
+        payback = np.where(flows > 0, outlay / flows, np.inf)
+    shape = (len(projects), len(rates), len(shocks), len(actions))
+    return {
+        "names": [p.name for p in projects],
+        "rates": rates,
+        "shocks": shocks,
+        "actions": [a[0] for a in actions],
+        "npv": present - outlay,
+        "profitability_index": present / outlay,
+        "payback": np.broadcast_to(payback, shape).copy(),
+    }
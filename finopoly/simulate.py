@@ -0,0 +1,171 @@
+"""Monte Carlo simulation of headless Finopoly games over a process pool."""
+import argparse
+import math
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .engine import FinopolyEngine, RandomPolicy
+from .rng import RandomStream
+
+
+class SimulationResult:
+    """Score distributions per seat, mergeable across worker chunks."""
+
+    def __init__(self, num_players, bin_width=1.0):
+        self.num_players = num_players
+        self.bin_width = bin_width
+        self.games = 0
+        self.count = [0] * num_players
+        self.total = [0.0] * num_players
+        self.total_sq = [0.0] * num_players
+        self.low = [math.inf] * num_players
+        self.high = [-math.inf] * num_players
+        self.wins = [0] * num_players
+        self.bankruptcies = [0] * num_players
+        self.histograms = [Counter() for _ in range(num_players)]
+
+    def record(self, scores, winner):
+        """Add one finished game; ``scores[seat]`` is ``None`` for bankrupt seats."""
+        self.games += 1
+        for seat, score in enumerate(scores):
+            if score is None:
+                self.bankruptcies[seat] += 1
+                continue
+            self.count[seat] += 1
+            self.total[seat] += score
+            self.total_sq[seat] += score * score
+            self.low[seat] = min(self.low[seat], score)
+            self.high[seat] = max(self.high[seat], score)
+            self.histograms[seat][math.floor(score / self.bin_width)] += 1
+        if winner is not None:
+            self.wins[winner] += 1
+
+    def merge(self, other):
+        self.games += other.games
+        for seat in range(self.num_players):
+            self.count[seat] += other.count[seat]
+            self.total[seat] += other.total[seat]
+            self.total_sq[seat] += other.total_sq[seat]
+            self.low[seat] = min(self.low[seat], other.low[seat])
+            self.high[seat] = max(self.high[seat], other.high[seat])
+            self.wins[seat] += other.wins[seat]
+            self.bankruptcies[seat] += other.bankruptcies[seat]
+            self.histograms[seat].update(other.histograms[seat])
+        return self
+
+    def mean(self, seat):
+        if not self.count[seat]:
+            return math.nan
+        return self.total[seat] / self.count[seat]
+
+    def std(self, seat):
+        n = self.count[seat]
+        if n < 2:
+            return math.nan
+        variance = (self.total_sq[seat] - self.total[seat] ** 2 / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def win_rate(self, seat):
+        if not self.games:
+            return math.nan
+        return self.wins[seat] / self.games
+
+    def histogram(self, seat):
+        """Sorted ``(bin_start, count)`` pairs for one seat."""
+        return [(b * self.bin_width, n) for b, n in sorted(self.histograms[seat].items())]
+
+    def summary(self):
+        return {
+            "games": self.games,
+            "seats": [
+                {
+                    "seat": seat,
+                    "mean": self.mean(seat),
+                    "std": self.std(seat),
+                    "min": self.low[seat] if self.count[seat] else None,
+                    "max": self.high[seat] if self.count[seat] else None,
+                    "win_rate": self.win_rate(seat),
+                    "bankruptcies": self.bankruptcies[seat],
+                }
+                for seat in range(self.num_players)
+            ],
+        }
+
+
+def game_rng(seed, index):
+    """Independent, platform-stable RNG for game ``index`` of a run."""
+    return RandomStream(seed, stream=index)
+
+
+def play_one(rng, policies):
+    game = FinopolyEngine(rng=rng)
+    seats = [game.add_player(f"Player {i+1}", policy) for i, policy in enumerate(policies)]
+    results = game.play_game()
+    scores = {id(player): total for player, total, *_ in results}
+    seat_scores = [scores.get(id(player)) for player in seats]
+    winner = seats.index(results[0][0]) if results else None
+    return seat_scores, winner
+
+
+def _run_chunk(seed, start, count, policies, bin_width):
+    result = SimulationResult(len(policies), bin_width)
+    rng = RandomStream(seed)
+    for index in range(start, start + count):
+        # Same draws as game_rng(seed, index), without a new generator per game.
+        result.record(*play_one(rng.reset(index), policies))
+    return result
+
+
+def simulate(n_games, seed=0, workers=None, num_players=4, policies=None, bin_width=1.0, chunk_size=None):
+    """Play ``n_games`` independent games and aggregate their final scores.
+
+    ``policies`` gives one ``Policy`` per seat (defaults to ``RandomPolicy``).
+    Game ``i`` always uses the same RNG stream for a given ``seed``, so the
+    per-game outcomes do not depend on ``workers`` or ``chunk_size``; replay
+    one with ``FinopolyEngine(rng=game_rng(seed, i))``. A ``seed`` of ``None``
+    draws fresh entropy once for the whole run.
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    if policies is None:
+        policies = [RandomPolicy() for _ in range(num_players)]
+    policies = list(policies)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(10_000, math.ceil(n_games / (workers * 8))))
+
+    result = SimulationResult(len(policies), bin_width)
+    chunks = [(start, min(chunk_size, n_games - start)) for start in range(0, n_games, chunk_size)]
+    if workers <= 1:
+        for start, count in chunks:
+            result.merge(_run_chunk(seed, start, count, policies, bin_width))
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_chunk, seed, start, count, policies, bin_width) for start, count in chunks]
+        for future in futures:
+            result.merge(future.result())
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate headless Finopoly games.")
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--players", type=int, default=4, choices=[3, 4, 5])
+    args = parser.parse_args(argv)
+
+    result = simulate(args.games, seed=args.seed, workers=args.workers, num_players=args.players)
+    print(f"{result.games} games")
+    for row in result.summary()["seats"]:
+        print(f"Seat {row['seat'] + 1}: mean {row['mean']:.2f} ± {row['std']:.2f}, "
+              f"win rate {row['win_rate']:.3f}, bankrupt {row['bankruptcies']}")
+
+
+if __name__ == "__main__":
+    main()
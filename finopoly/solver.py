@@ -0,0 +1,286 @@
+"""Exact expected final score for one player on a given board.
+
+``Solver`` runs memoized dynamic programming over the states a player can
+be in at the start of a turn. A state records:
+
+* round, position and skip flag;
+* cash, on a grid of ``cash_step``;
+* users, debt, dilution, VC and IPO flags;
+* the owned projects with their current cash flow and expiry round;
+* the projects other players own.
+
+From a state it averages over the six rolls and, on an Event tile, over the
+events. At every decision it takes the best move, then applies the same
+end-of-round rules as ``FinopolyEngine``: interest or bankruptcy, then the
+next round. After the last round it scores the state with the ``end_game``
+formula. A bankrupt player scores 0.
+
+Two simplifications keep the search small without changing the optimum:
+
+* Financing is only considered at each option's maximum. Interest costs
+  less than the cash it brings, and dilution does not depend on the
+  amount, so a smaller draw is never better.
+* Opponents are not modelled. Events only touch the player who lands on
+  them and rounds end the same way whatever others do, so the only thing
+  other players change is which projects are still for sale. That set is
+  part of the state, taken from the game when a question is asked.
+
+``best_move`` scores every legal move at a decision in a live game; the
+app shows it as a hint. ``SolverPolicy`` plays the optimal policy.
+
+The memo grows with every new position asked about, and in a multiplayer
+game each change in which projects are taken opens a fresh subtree. With
+``max_states`` set, ``best_move`` empties the memo before a question once
+it holds that many states; a solve is never interrupted, so the memo holds
+at most ``max_states`` plus one solve's worth.
+"""
+from collections import namedtuple
+
+from .engine import (
+    CASH_WEIGHT,
+    DEBT_INTEREST,
+    EQUITY_DILUTION,
+    EXPAND_COST,
+    EXPAND_FACTOR,
+    IPO_BONUS,
+    NPV_WEIGHT,
+    PIVOT_COST,
+    PIVOT_EXTRA_LIFE,
+    PIVOT_FACTOR,
+    PROJECT_BONUS,
+    SALE_RECOVERY,
+    STRATEGIC_WEIGHT,
+    USERS_WEIGHT,
+    VC_DILUTION,
+    Policy,
+)
+from .events import ADD, REVENUE, SET
+from .turnlog import FINANCE, INVEST, IPO, STRATEGY
+from .valuation import DEFAULT_RATE, IPO_NPV_FACTOR, annuity_factor
+
+CASH_STEP = 0.01 # $M; every amount in the rules is a whole number of cents
+DIE_FACES = 6
+IPO_ROUND = 4
+
+# ``projects`` is a sorted tuple of ``(project index, annual cash flow, expiry round)``;
+# ``taken`` is a bitmask of projects other players own.
+State = namedtuple("State", "round position skip cash users debt dilution vc_used ipo_done projects taken")
+
+
+class Solver:
+    """Optimal single-player values and moves for one game's board and catalog."""
+
+    def __init__(self, game, cash_step=CASH_STEP, max_states=None):
+        self.cash_step = cash_step
+        self.max_states = max_states
+        self.num_rounds = game.num_rounds
+        self.final_round = game.num_rounds + 1 # final_scores runs after the last round advances
+        self.board_size = len(game.board)
+        self.projects = [(p.cost, p.base_cash_flow, p.base_life, p.user_gain, p.name) for p in game.projects]
+        self.options = [(option.name, option.max_amount) for option in game.financing_options]
+        self.effects = [event.impact for event in game.events]
+        self.tiles = []
+        for tile in game.board:
+            if tile.tile_type == "Investment":
+                self.tiles.append((INVEST, game.projects.index(tile.action)))
+            elif tile.tile_type == "Financing":
+                self.tiles.append((FINANCE, None))
+            elif tile.tile_type == "Event":
+                self.tiles.append(("event", None))
+            elif tile.tile_type == "Neutral":
+                self.tiles.append(("neutral", None))
+            else:
+                self.tiles.append((IPO if tile.action == "IPO" else STRATEGY, None))
+        self.values = {}
+
+    # --- States ---
+    def bucket(self, cash):
+        return round(round(cash / self.cash_step) * self.cash_step, 10)
+
+    def state(self, cash, users, **fields):
+        return State(cash=self.bucket(cash), users=round(users, 9), **fields)
+
+    def state_of(self, game, player):
+        """``player``'s state in ``game``, ready for the next roll."""
+        projects = tuple(sorted((game.projects.index(p), round(p.annual_cash_flow, 9), p.purchase_round + p.life)
+                                for p in player.projects))
+        taken = 0
+        for i, project in enumerate(game.projects):
+            if project.owner is not None and project.owner is not player:
+                taken |= 1 << i
+        return self.state(player.cash, player.users, round=game.current_round, position=player.position,
+                          skip=bool(player.skip_next_turn), debt=player.debt,
+                          dilution=round(player.equity_dilution, 9), vc_used=player.vc_funding_used,
+                          ipo_done=player.ipo_done, projects=projects, taken=taken)
+
+    def with_cash(self, s, delta, **changes):
+        return s._replace(cash=self.bucket(s.cash + delta), **changes)
+
+    def revenue(self, s):
+        return sum(cash_flow for _, cash_flow, _ in s.projects)
+
+    def owns(self, s, names):
+        return any(self.projects[i][4] in names for i, _, _ in s.projects)
+
+    # --- Values ---
+    def final_score(self, s):
+        npv = sum(cash_flow * annuity_factor(DEFAULT_RATE, expiry - self.final_round) for _, cash_flow, expiry in s.projects)
+        npv *= 1 - s.dilution
+        if s.ipo_done:
+            npv *= IPO_NPV_FACTOR
+        strategic = (IPO_BONUS if s.ipo_done else 0) + len(s.projects) * PROJECT_BONUS
+        return NPV_WEIGHT * npv + USERS_WEIGHT * s.users + CASH_WEIGHT * s.cash + STRATEGIC_WEIGHT * strategic
+
+    def end_round(self, s):
+        """Expected final score once the turn that left ``s`` is over."""
+        if s.debt > 0:
+            interest = s.debt * DEBT_INTEREST
+            if s.cash < interest:
+                return 0.0
+            s = self.with_cash(s, -interest)
+        s = s._replace(round=s.round + 1)
+        if s.round > self.num_rounds:
+            return self.final_score(s)
+        return self.value(s)
+
+    def value(self, s):
+        """Expected final score under optimal play from the start of a turn in state ``s``."""
+        cached = self.values.get(s)
+        if cached is not None:
+            return cached
+        if s.skip:
+            result = self.end_round(s._replace(skip=False))
+        else:
+            total = 0.0
+            for roll in range(1, DIE_FACES + 1):
+                position = (s.position + roll) % self.board_size
+                total += self.landing_value(s._replace(position=position))
+            result = total / DIE_FACES
+        self.values[s] = result
+        return result
+
+    def landing_value(self, s):
+        """Expected final score after landing on ``s.position``."""
+        kind, _ = self.tiles[s.position]
+        if kind == "event":
+            return sum(self.end_round(self.apply_effect(s, effect)) for effect in self.effects) / len(self.effects)
+        if kind == "neutral":
+            return self.end_round(self.with_cash(s, self.revenue(s)))
+        return max(self.moves(s).values())
+
+    def apply_effect(self, s, effect):
+        if effect.unless_owns and self.owns(s, effect.unless_owns):
+            return s
+        value = effect.magnitude
+        if effect.per == REVENUE:
+            value = value * self.revenue(s)
+        if effect.field == "cash":
+            return self.with_cash(s, value if effect.op == ADD else value - s.cash)
+        if effect.field == "users":
+            users = s.users + value if effect.op == ADD else value
+            if effect.floor is not None:
+                users = max(effect.floor, users)
+            return s._replace(users=round(users, 9))
+        if effect.field == "skip_next_turn":
+            return s._replace(skip=bool(value) if effect.op == SET else s.skip)
+        return s # next_project_discount: no rule reads it
+
+    # --- Decisions ---
+    def after_moves(self, s):
+        """``{move: state after it}`` for the decision on ``s.position``, passing included."""
+        kind, index = self.tiles[s.position]
+        moves = {None: s}
+        if kind == INVEST:
+            cost, cash_flow, life, user_gain, _ = self.projects[index]
+            owned = any(i == index for i, _, _ in s.projects) or s.taken >> index & 1
+            if not owned and s.cash >= cost:
+                projects = tuple(sorted(s.projects + ((index, cash_flow, s.round + life),)))
+                moves[True] = self.with_cash(s, -cost, users=round(s.users + user_gain, 9), projects=projects)
+        elif kind == FINANCE:
+            for i, (name, amount) in enumerate(self.options):
+                if name == "VC Funding" and not s.vc_used:
+                    moves[(i, amount)] = self.with_cash(s, amount, vc_used=True, dilution=round(s.dilution + VC_DILUTION, 9))
+                elif name == "IPO" and s.round >= IPO_ROUND:
+                    moves[(i, amount)] = self.with_cash(s, amount, ipo_done=True)
+                elif name == "Debt":
+                    moves[(i, amount)] = self.with_cash(s, amount, debt=s.debt + amount)
+                elif name == "Equity":
+                    moves[(i, amount)] = self.with_cash(s, amount, dilution=round(s.dilution + EQUITY_DILUTION, 9))
+        elif kind == IPO:
+            if s.round >= IPO_ROUND and not s.ipo_done:
+                moves[True] = self.with_cash(s, 100, ipo_done=True)
+        elif kind == STRATEGY:
+            for j, (index, cash_flow, expiry) in enumerate(s.projects):
+                others = s.projects[:j] + s.projects[j + 1:]
+                if s.cash >= EXPAND_COST:
+                    adjusted = (index, round(cash_flow * EXPAND_FACTOR, 9), expiry)
+                    moves[(index, "Expand")] = self.with_cash(s, -EXPAND_COST, projects=tuple(sorted(others + (adjusted,))))
+                if s.cash >= PIVOT_COST:
+                    adjusted = (index, round(cash_flow * PIVOT_FACTOR, 9), expiry + PIVOT_EXTRA_LIFE)
+                    moves[(index, "Pivot")] = self.with_cash(s, -PIVOT_COST, projects=tuple(sorted(others + (adjusted,))))
+                moves[(index, "Sell")] = self.with_cash(s, self.projects[index][0] * SALE_RECOVERY, projects=others)
+        return moves
+
+    def moves(self, s):
+        """``{move: expected final score}`` for the decision on ``s.position``."""
+        return {move: self.end_round(after) for move, after in self.after_moves(s).items()}
+
+    def best_move(self, game, player):
+        """``(kind, move, values)`` for ``player`` standing on their tile mid-turn in ``game``.
+
+        Moves are ``None`` to pass, ``True`` to invest or go public,
+        ``(option index, amount)`` to raise money and ``(project index,
+        action)`` on a Strategy tile. ``values`` maps each to its expected
+        final score under optimal play.
+        """
+        s = self.state_of(game, player)
+        kind, _ = self.tiles[s.position]
+        if self.max_states is not None and len(self.values) >= self.max_states:
+            self.values.clear()
+        values = self.moves(s)
+        return kind, max(values, key=values.get), values
+
+    def describe(self, game, player, move):
+        """A short phrase for ``move`` on ``player``'s tile, e.g. "raise $50M through Debt"."""
+        kind, index = self.tiles[player.position]
+        if move is None:
+            return "pass"
+        if kind == INVEST:
+            return f"invest in {game.projects[index].name}"
+        if kind == FINANCE:
+            return f"raise ${move[1]}M through {game.financing_options[move[0]].name}"
+        if kind == IPO:
+            return "conduct the IPO"
+        return f"{move[1].lower()} {game.projects[move[0]].name}"
+
+
+class SolverPolicy(Policy):
+    """Plays the solver's optimal move; one ``Solver`` per board, built on first use."""
+
+    def __init__(self, cash_step=CASH_STEP):
+        self.cash_step = cash_step
+        self.solvers = {}
+
+    def solver_for(self, game):
+        solver = self.solvers.get(game.board_positions)
+        if solver is None:
+            solver = self.solvers[game.board_positions] = Solver(game, self.cash_step)
+        return solver
+
+    def decide(self, game, player):
+        _, move, _ = self.solver_for(game).best_move(game, player)
+        return move
+
+    def choose_investment(self, game, player, project):
+        return self.decide(game, player) is True
+
+    def choose_financing(self, game, player, options):
+        move = self.decide(game, player)
+        return None if move is None else (game.financing_options[move[0]], move[1])
+
+    def choose_ipo(self, game, player):
+        return self.decide(game, player) is True
+
+    def choose_strategy(self, game, player):
+        move = self.decide(game, player)
+        return None if move is None else (game.projects[move[0]], move[1])
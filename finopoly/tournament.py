@@ -0,0 +1,333 @@
+"""Round-robin tournaments between policies, streamed to a columnar store.
+
+Every pair of policies plays a match of ``games`` games. Seats alternate
+between the two, and the alternation flips each game so both sides sit in
+every seat. Game ``i`` of every match uses the same random stream, so all
+pairs face the same boards and dice.
+
+Games run in chunks on a process pool, with only a few chunks in flight at
+once. Each finished chunk comes back as one row per seat. ``ResultWriter``
+appends the rows to one raw little-endian file per column, and
+``schema.json`` lists the columns, their dtypes and the policy names;
+``read_results`` maps the files back as arrays. The same rows are folded
+into ``TournamentResult``: counts plus Welford mean and variance merged
+chunk by chunk, with Wilson intervals for win rates. Memory stays flat
+however many games are played.
+
+Run it with ``python -m finopoly.tournament --policies always-debt early-vc
+ipo-round-4 low-risk score``.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .engine import FinopolyEngine
+from .policies import POLICIES, load_policy
+from .rng import RandomStream
+
+SCHEMA_FILE = "schema.json"
+FORMAT_VERSION = 1
+COLUMNS = (
+    ("game", "<u8"), # Index across the whole tournament
+    ("match", "<u4"), # Index into TournamentResult.pairs
+    ("seat", "u1"),
+    ("policy", "<u2"), # Index into the schema's policy names
+    ("score", "<f8"), # NaN for a bankrupt seat, as are npv, users and cash
+    ("npv", "<f8"),
+    ("users", "<f8"),
+    ("cash", "<f8"),
+    ("rank", "u1"), # 1 for the winner; 0 if bankrupt
+    ("won", "?"),
+    ("bankrupt", "?"),
+)
+Z_95 = 1.959963984540054
+
+
+def wilson_interval(successes, trials, z=Z_95):
+    """Wilson score interval for a binomial proportion."""
+    if not trials:
+        return math.nan, math.nan
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return centre - half, centre + half
+
+
+# --- Streaming statistics ---
+class RunningStats:
+    """Count, mean and sum of squared deviations (Welford), mergeable across chunks."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def of(cls, values):
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return cls()
+        mean = float(values.mean())
+        return cls(int(values.size), mean, float(((values - mean) ** 2).sum()))
+
+    def add(self, value):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """Combine with another partition's statistics (Chan et al.)."""
+        if not other.n:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        return self
+
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    def interval(self, z=Z_95):
+        """Normal-approximation confidence interval for the mean."""
+        if self.n < 2:
+            return math.nan, math.nan
+        half = z * math.sqrt(self.variance() / self.n)
+        return self.mean - half, self.mean + half
+
+
+class TournamentResult:
+    """Per-policy and head-to-head tallies, updated one chunk of rows at a time."""
+
+    def __init__(self, policies, pairs):
+        self.policies = list(policies)
+        self.pairs = list(pairs)
+        k = len(self.policies)
+        self.games = 0
+        self.seats = np.zeros(k, dtype=np.int64) # Seat-games played
+        self.wins = np.zeros(k, dtype=np.int64)
+        self.bankruptcies = np.zeros(k, dtype=np.int64)
+        self.scores = [RunningStats() for _ in range(k)]
+        self.pair_games = np.zeros((k, k), dtype=np.int64)
+        self.pair_wins = np.zeros((k, k), dtype=np.int64) # [a, b]: games vs b won by a seat of a
+
+    def record(self, rows):
+        k = len(self.policies)
+        policy = rows["policy"].astype(np.intp)
+        self.games += int((rows["seat"] == 0).sum())
+        self.seats += np.bincount(policy, minlength=k)
+        self.wins += np.bincount(policy, weights=rows["won"], minlength=k).astype(np.int64)
+        self.bankruptcies += np.bincount(policy, weights=rows["bankrupt"], minlength=k).astype(np.int64)
+        for p in np.unique(policy):
+            self.scores[p].merge(RunningStats.of(rows["score"][(policy == p) & ~rows["bankrupt"]]))
+
+        pairs = np.array(self.pairs, dtype=np.intp).reshape(-1, 2)
+        first = rows["seat"] == 0
+        games = np.bincount(rows["match"][first], minlength=len(pairs))
+        np.add.at(self.pair_games, (pairs[:, 0], pairs[:, 1]), games)
+        np.add.at(self.pair_games, (pairs[:, 1], pairs[:, 0]), games)
+        won = rows["won"]
+        np.add.at(self.pair_wins, (policy[won], self._opponent(pairs, rows["match"][won], policy[won])), 1)
+
+    @staticmethod
+    def _opponent(pairs, match, policy):
+        a, b = pairs[match, 0], pairs[match, 1]
+        return np.where(policy == a, b, a)
+
+    def win_rate(self, p):
+        return float(self.wins[p] / self.seats[p]) if self.seats[p] else math.nan
+
+    def summary(self):
+        return {
+            "games": self.games,
+            "policies": [
+                {
+                    "policy": name,
+                    "seats": int(self.seats[p]),
+                    "win_rate": self.win_rate(p),
+                    "win_rate_ci": wilson_interval(int(self.wins[p]), int(self.seats[p])),
+                    "mean_score": self.scores[p].mean if self.scores[p].n else math.nan,
+                    "mean_score_ci": self.scores[p].interval(),
+                    "bankrupt_rate": float(self.bankruptcies[p] / self.seats[p]) if self.seats[p] else math.nan,
+                }
+                for p, name in enumerate(self.policies)
+            ],
+            "head_to_head": [
+                {
+                    "policy": self.policies[a],
+                    "opponent": self.policies[b],
+                    "games": int(self.pair_games[a, b]),
+                    "win_share": float(self.pair_wins[a, b] / self.pair_games[a, b]),
+                    "win_share_ci": wilson_interval(int(self.pair_wins[a, b]), int(self.pair_games[a, b])),
+                }
+                for a, b in itertools.permutations(range(len(self.policies)), 2)
+                if self.pair_games[a, b]
+            ],
+        }
+
+
+# --- Columnar store ---
+class ResultWriter:
+    """Appends row chunks to one file per column under ``path``.
+
+    The schema's row count is rewritten after each chunk reaches the files,
+    so a run that dies keeps every chunk appended before it.
+    """
+
+    def __init__(self, path, policies, metadata=None):
+        if os.path.exists(os.path.join(path, SCHEMA_FILE)):
+            raise FileExistsError(f"{path} already holds tournament results")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.rows = 0
+        self.schema = {
+            "format": FORMAT_VERSION,
+            "rows": 0,
+            "columns": [{"name": name, "dtype": dtype, "file": f"{name}.bin"} for name, dtype in COLUMNS],
+            "policies": list(policies),
+            **(metadata or {}),
+        }
+        self.files = {name: open(os.path.join(path, f"{name}.bin"), "ab") for name, _ in COLUMNS}
+        self.write_schema()
+
+    def write_schema(self):
+        self.schema["rows"] = self.rows
+        temporary = os.path.join(self.path, SCHEMA_FILE + ".tmp")
+        with open(temporary, "w") as handle:
+            json.dump(self.schema, handle, indent=2)
+        os.replace(temporary, os.path.join(self.path, SCHEMA_FILE))
+
+    def append(self, rows):
+        for name, dtype in COLUMNS:
+            np.asarray(rows[name], dtype=dtype).tofile(self.files[name])
+        for handle in self.files.values():
+            handle.flush()
+        self.rows += len(rows["game"])
+        self.write_schema()
+
+    def close(self):
+        for handle in self.files.values():
+            handle.close()
+        self.write_schema()
+
+
+def read_results(path):
+    """``(schema, columns)`` for a results directory; columns are read-only memory maps."""
+    with open(os.path.join(path, SCHEMA_FILE)) as handle:
+        schema = json.load(handle)
+    if schema["format"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported tournament format {schema['format']}")
+    rows = schema["rows"]
+    columns = {}
+    for column in schema["columns"]:
+        dtype = np.dtype(column["dtype"])
+        file = os.path.join(path, column["file"])
+        columns[column["name"]] = np.memmap(file, dtype=dtype, mode="r", shape=(rows,)) if rows else np.empty(0, dtype)
+    return schema, columns
+
+
+# --- Matches ---
+def round_robin(n_policies):
+    return list(itertools.combinations(range(n_policies), 2))
+
+
+def play_chunk(names, num_players, seed, match, pair, start, count, games_per_match):
+    """Play games ``start..start+count`` of one match; returns the rows as column arrays."""
+    policies = [load_policy(name) for name in names]
+    rng = RandomStream(seed)
+    rows = {name: [] for name, _ in COLUMNS}
+    for i in range(start, start + count):
+        lineup = [pair[(seat + i) % 2] for seat in range(num_players)]
+        game = FinopolyEngine(rng=rng.reset(i))
+        game.log = None
+        seats = [game.add_player(f"Seat {seat + 1}", policies[p]) for seat, p in enumerate(lineup)]
+        ranked = game.play_game()
+        place = {id(player): (rank, row) for rank, (player, *row) in enumerate(ranked, 1)}
+        for seat, (player, p) in enumerate(zip(seats, lineup)):
+            rank, row = place.get(id(player), (0, None))
+            score, npv, users, cash = row[:4] if row is not None else (math.nan,) * 4
+            values = (match * games_per_match + i, match, seat, p, score, npv, users, cash, rank, rank == 1, row is None)
+            for (name, _), value in zip(COLUMNS, values):
+                rows[name].append(value)
+    return {name: np.array(rows[name], dtype=dtype) for name, dtype in COLUMNS}
+
+
+def tasks(pairs, games, chunk_size):
+    for match, pair in enumerate(pairs):
+        for start in range(0, games, chunk_size):
+            yield match, pair, start, min(chunk_size, games - start)
+
+
+def run_tournament(names, games, path, num_players=4, seed=0, workers=None, chunk_size=250):
+    """Play every pair of ``names`` for ``games`` games, streaming rows to ``path``."""
+    names = list(names)
+    if len(names) < 2:
+        raise ValueError("A tournament needs at least two policies")
+    for name in names:
+        load_policy(name) # Fail before starting workers
+    if workers is None:
+        workers = os.cpu_count() or 1
+    pairs = round_robin(len(names))
+    result = TournamentResult(names, pairs)
+    writer = ResultWriter(path, names, {"num_players": num_players, "seed": seed,
+                                        "games_per_match": games, "pairs": pairs})
+
+    def consume(rows):
+        writer.append(rows)
+        result.record(rows)
+
+    try:
+        if workers <= 1:
+            for task in tasks(pairs, games, chunk_size):
+                consume(play_chunk(names, num_players, seed, *task, games))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = set()
+                for task in tasks(pairs, games, chunk_size):
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            consume(future.result())
+                    pending.add(pool.submit(play_chunk, names, num_players, seed, *task, games))
+                for future in pending:
+                    consume(future.result())
+    finally:
+        writer.close()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Round-robin tournament between Finopoly policies.")
+    parser.add_argument("--policies", nargs="+", default=["always-debt", "early-vc", "ipo-round-4", "low-risk", "score"],
+                        help=f"Names ({', '.join(POLICIES)}) or module:Class paths")
+    parser.add_argument("--games", type=int, default=1000, help="Games per pair")
+    parser.add_argument("--players", type=int, default=4, choices=[3, 4, 5])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=250)
+    parser.add_argument("--out", default="tournament-results")
+    args = parser.parse_args(argv)
+
+    result = run_tournament(args.policies, args.games, args.out, num_players=args.players, seed=args.seed,
+                            workers=args.workers, chunk_size=args.chunk_size)
+    summary = result.summary()
+    print(f"{summary['games']} games, rows in {args.out}")
+    for row in sorted(summary["policies"], key=lambda row: -row["win_rate"]):
+        low, high = row["win_rate_ci"]
+        score_low, score_high = row["mean_score_ci"]
+        print(f"{row['policy']:<14} win {row['win_rate']:.3f} [{low:.3f}, {high:.3f}]  "
+              f"score {row['mean_score']:.2f} [{score_low:.2f}, {score_high:.2f}]  bankrupt {row['bankrupt_rate']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
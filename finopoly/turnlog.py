@@ -0,0 +1,157 @@
+"""Compact append-only record of everything random or chosen in a game.
+
+The board layout and the seats go in a header. Each seat is its name's
+UTF-8 length as a varint (seven bits a byte, low bits first), the name,
+and a flags byte whose low bit marks a computer seat. After that each turn
+is one to three bytes: the first byte holds the dice roll in its low nibble
+(0 when the turn was skipped) and what happened on the tile in its high
+nibble, followed by that outcome's arguments:
+
+=========  ===========================================
+PASS       nothing the log needs (also Neutral tiles)
+EVENT      index into ``game.events``
+INVEST     none, the tile says which project
+FINANCE    index into ``game.financing_options``, $M
+IPO        none
+STRATEGY   index into ``game.projects``, action index
+=========  ===========================================
+
+Everything else about a turn follows from the rules, so a whole game fits
+in well under a hundred bytes. ``finopoly.replay`` turns a log back into
+game state.
+"""
+# Version 1 stored each name's length in one byte; versions 1 and 2 have no
+# seat flags, and their seats load as human.
+FORMAT_VERSION = 3
+BOT_FLAG = 0x01
+
+PASS, EVENT, INVEST, FINANCE, IPO, STRATEGY = range(6)
+ARGUMENT_BYTES = {PASS: 0, EVENT: 1, INVEST: 0, FINANCE: 2, IPO: 0, STRATEGY: 2}
+STRATEGY_ACTIONS = ("Expand", "Pivot", "Sell")
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(raw, at):
+    """``(value, offset after it)``."""
+    value = shift = 0
+    while True:
+        byte = raw[at]
+        value |= (byte & 0x7F) << shift
+        at += 1
+        if byte < 0x80:
+            return value, at
+        shift += 7
+
+
+class TurnLog:
+    """Header plus encoded turns, appended to by ``FinopolyEngine``."""
+
+    def __init__(self, positions=(), names=(), bots=None):
+        self.positions = tuple(positions)
+        self.names = list(names)
+        self.bots = list(bots) if bots is not None else [False] * len(self.names) # Computer seat, per name
+        self.data = bytearray()
+        self.offsets = []
+        self._roll = 0
+        self._outcome = (PASS,)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def add_player(self, name, bot=False):
+        if self.offsets:
+            raise ValueError("Players must join before the first turn is logged")
+        if len(self.names) == 255:
+            raise ValueError("A turn log holds at most 255 players")
+        self.names.append(name)
+        self.bots.append(bool(bot))
+
+    def record_roll(self, roll):
+        self._roll = roll
+
+    def record_event(self, index):
+        self._outcome = (EVENT, index)
+
+    def record_invest(self):
+        self._outcome = (INVEST,)
+
+    def record_financing(self, option_index, amount):
+        if amount != int(amount) or not 0 <= amount <= 255:
+            raise ValueError(f"Financing amounts are logged as whole $M up to 255, got {amount}")
+        self._outcome = (FINANCE, option_index, int(amount))
+
+    def record_ipo(self):
+        self._outcome = (IPO,)
+
+    def record_strategy(self, project_index, action):
+        self._outcome = (STRATEGY, project_index, STRATEGY_ACTIONS.index(action))
+
+    def end_turn(self):
+        kind, *args = self._outcome
+        self.offsets.append(len(self.data))
+        self.data.append(kind << 4 | self._roll)
+        self.data.extend(args)
+        self._roll = 0
+        self._outcome = (PASS,)
+
+    def turn(self, index):
+        """``(roll, kind, args)`` for one turn."""
+        start = self.offsets[index]
+        first = self.data[start]
+        kind = first >> 4
+        return first & 0x0F, kind, tuple(self.data[start + 1:start + 1 + ARGUMENT_BYTES[kind]])
+
+    def turns(self):
+        """Every turn as ``(roll, kind, args)``, decoded in one pass."""
+        data = self.data
+        decoded = []
+        i = 0
+        while i < len(data):
+            first = data[i]
+            kind = first >> 4
+            end = i + 1 + ARGUMENT_BYTES[kind]
+            decoded.append((first & 0x0F, kind, tuple(data[i + 1:end])))
+            i = end
+        return decoded
+
+    def to_bytes(self):
+        header = bytearray([FORMAT_VERSION, len(self.positions)])
+        header.extend(self.positions)
+        header.append(len(self.names))
+        for name, bot in zip(self.names, self.bots):
+            encoded = name.encode("utf-8")
+            write_varint(header, len(encoded))
+            header.extend(encoded)
+            header.append(BOT_FLAG if bot else 0)
+        return bytes(header + self.data)
+
+    @classmethod
+    def from_bytes(cls, raw):
+        version = raw[0]
+        if not 1 <= version <= FORMAT_VERSION:
+            raise ValueError(f"Unsupported turn log format {version}")
+        size = raw[1]
+        log = cls(raw[2:2 + size])
+        count = raw[2 + size]
+        at = 3 + size
+        for _ in range(count):
+            length, at = read_varint(raw, at) if version > 1 else (raw[at], at + 1)
+            log.names.append(bytes(raw[at:at + length]).decode("utf-8"))
+            at += length
+            if version > 2:
+                log.bots.append(bool(raw[at] & BOT_FLAG))
+                at += 1
+            else:
+                log.bots.append(False)
+        log.data = bytearray(raw[at:])
+        i = 0
+        while i < len(log.data):
+            log.offsets.append(i)
+            i += 1 + ARGUMENT_BYTES[log.data[i] >> 4]
+        return log
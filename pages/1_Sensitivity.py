@@ -0,0 +1,68 @@
+import numpy as np
+import streamlit as st
+
+from finopoly.catalog import shared_catalog
+from finopoly.sensitivity import evaluate, revenue_shocks
+
+MAX_STEPS = 201 # Per axis; the largest grid is about 22 MiB for the 8 catalog projects
+METRICS = {"NPV ($M)": "npv", "Profitability index": "profitability_index", "Payback (years)": "payback"}
+
+@st.cache_data(max_entries=8, ttl=3600) # At most ~180 MiB, however many grids are asked for
+def sensitivity_grid(rate_range, rate_steps, shock_range, shock_steps):
+    # One vectorized evaluation per grid; the sliders below only index into it.
+    rates = np.linspace(rate_range[0] / 100, rate_range[1] / 100, rate_steps)
+    shocks = np.linspace(shock_range[0] / 100, shock_range[1] / 100, shock_steps)
+    return evaluate(shared_catalog().projects, rates, shocks)
+
+def plotted(values):
+    # Payback is infinite once the cash flow is gone; charts leave a gap instead.
+    return np.where(np.isfinite(values), values, np.nan)
+
+def nearest(values, target):
+    return int(np.abs(values - target).argmin())
+
+def main():
+    st.title("Project Sensitivity")
+    st.write("How each project's value responds to the discount rate, a change in its annual cash flow, "
+             "and an Expand or Pivot made when it is bought (costs included).")
+
+    st.sidebar.subheader("Grid")
+    rate_range = st.sidebar.slider("Discount rates (%)", 0.0, 50.0, (0.0, 30.0), step=0.5)
+    rate_steps = st.sidebar.number_input("Rate steps", min_value=2, max_value=MAX_STEPS, value=121)
+    shock_range = st.sidebar.slider("Cash-flow shocks (%)", -100.0, 100.0, (-50.0, 50.0), step=1.0)
+    shock_steps = st.sidebar.number_input("Shock steps", min_value=2, max_value=MAX_STEPS, value=101)
+    grid = sensitivity_grid(rate_range, int(rate_steps), shock_range, int(shock_steps))
+    rates, shocks, names, actions = grid["rates"], grid["shocks"], grid["names"], grid["actions"]
+
+    events = revenue_shocks(shared_catalog())
+    shock_help = ", ".join(f"{name}: {shock:+.0%}" for name, shock in events.items())
+    r = st.select_slider("Discount rate", options=range(len(rates)), value=nearest(rates, 0.10),
+                         format_func=lambda i: f"{rates[i]:.2%}")
+    s = st.select_slider("Cash-flow shock", options=range(len(shocks)),
+                         value=nearest(shocks, next(iter(events.values()), 0.0)),
+                         format_func=lambda i: f"{shocks[i]:+.1%}", help=shock_help or None)
+
+    st.subheader(f"At {rates[r]:.2%} and a {shocks[s]:+.1%} cash-flow shock")
+    table = {"Project": names}
+    for a, action in enumerate(actions):
+        table[f"{action} NPV ($M)"] = np.round(grid["npv"][:, r, s, a], 2)
+        table[f"{action} PI"] = np.round(grid["profitability_index"][:, r, s, a], 3)
+        table[f"{action} payback"] = np.round(grid["payback"][:, r, s, a], 2)
+    st.dataframe(table, hide_index=True)
+
+    metric_column, action_column = st.columns(2)
+    metric = METRICS[metric_column.radio("Chart", list(METRICS), horizontal=True)]
+    a = actions.index(action_column.radio("Action", actions, horizontal=True))
+
+    st.subheader("Against the discount rate")
+    by_rate = {"Rate (%)": rates * 100}
+    by_rate.update({name: plotted(grid[metric][i, :, s, a]) for i, name in enumerate(names)})
+    st.line_chart(by_rate, x="Rate (%)", y=names)
+
+    st.subheader("Against the cash-flow shock")
+    by_shock = {"Shock (%)": shocks * 100}
+    by_shock.update({name: plotted(grid[metric][i, r, :, a]) for i, name in enumerate(names)})
+    st.line_chart(by_shock, x="Shock (%)", y=names)
+
+if __name__ == "__main__":
+    main()
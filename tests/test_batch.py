@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from finopoly.batch import GameBatch
+
+
+def test_money_columns_are_float64():
+    batch = GameBatch(4)
+    for column in (batch.cash, batch.users, batch.debt, batch.revenue, batch.cash_flow,
+                   batch.catalog.cost, batch.catalog.cash_flow, batch.catalog.user_gain):
+        assert column.dtype == np.float64
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_running_revenue_matches_owned_cash_flow(seed):
+    # Expand, Pivot and Sell update revenue in place; it must not drift from the projects.
+    batch = GameBatch(2000, rng=np.random.default_rng(seed))
+    while not batch.game_over:
+        batch.step()
+        for seat in range(batch.num_players):
+            owned = np.where(batch.owner == seat, batch.cash_flow, 0.0).sum(axis=1)
+            np.testing.assert_allclose(batch.revenue[seat], owned, rtol=0, atol=1e-9)
@@ -0,0 +1,14 @@
+from finopoly import markov
+from finopoly.boards import search
+
+
+def test_search_does_not_depend_on_workers():
+    serial = search(2500, seed=0, workers=1, top_k=3)
+    parallel = search(2500, seed=0, workers=2, top_k=3)
+    assert [l["positions"] for l in serial] == [l["positions"] for l in parallel]
+
+
+def test_search_leaves_markov_caches_alone():
+    before = markov._turn_powers.cache_info().currsize, markov.reach_probability.cache_info().currsize
+    search(50, seed=1, workers=1, top_k=3)
+    assert (markov._turn_powers.cache_info().currsize, markov.reach_probability.cache_info().currsize) == before
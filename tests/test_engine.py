@@ -0,0 +1,94 @@
+import pytest
+
+from finopoly.engine import FinopolyEngine, RandomPolicy
+from finopoly.valuation import DEFAULT_RATE, IPO_NPV_FACTOR, annuity_factor
+
+
+def recomputed(player, current_round):
+    """Player aggregates rebuilt from ``player.projects`` from scratch."""
+    total = sum(p.annual_cash_flow for p in player.projects)
+    by_expiry = {}
+    for p in player.projects:
+        expiry = p.purchase_round + p.life
+        if expiry > current_round:
+            by_expiry[expiry] = by_expiry.get(expiry, 0) + p.annual_cash_flow
+    names = {}
+    for p in player.projects:
+        names[p.name] = names.get(p.name, 0) + 1
+    return total, by_expiry, names
+
+
+def live_buckets(by_expiry, current_round):
+    # Buckets left at zero by a sale, or recreated by a move on an expired
+    # project, add no NPV and may linger until the next round.
+    return {expiry: cash_flow for expiry, cash_flow in by_expiry.items()
+            if expiry > current_round and abs(cash_flow) > 1e-9}
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_aggregates_match_recomputation(seed):
+    game = FinopolyEngine(seed=seed, default_policy=RandomPolicy())
+    for name in ("A", "B", "C", "D"):
+        game.add_player(name)
+    while not game.game_over:
+        game.take_turn()
+        for player in game.players:
+            total, by_expiry, names = recomputed(player, game.current_round)
+            assert player.total_cash_flow == pytest.approx(total, abs=1e-9)
+            assert live_buckets(player.cash_flow_by_expiry, game.current_round) == pytest.approx(by_expiry, abs=1e-9)
+            assert player.owned_names == names
+            npv = sum(p.annual_cash_flow * annuity_factor(DEFAULT_RATE, p.purchase_round + p.life - game.current_round)
+                      for p in player.projects)
+            assert player.calculate_total_npv(game.current_round) == pytest.approx(
+                npv * (1 - player.equity_dilution) * (IPO_NPV_FACTOR if player.ipo_done else 1), abs=1e-9)
+
+
+def test_random_games_cover_every_strategy():
+    actions = set()
+    for seed in range(40):
+        game = FinopolyEngine(seed=seed, default_policy=RandomPolicy())
+        for name in ("A", "B", "C", "D"):
+            game.add_player(name)
+        original = game.apply_strategy
+        game.apply_strategy = lambda player, project, action, original=original: actions.add(action) or original(player, project, action)
+        game.play_game()
+    assert actions == {"Expand", "Pivot", "Sell"}
+
+
+def test_sell_and_rebuy_starts_a_fresh_schedule():
+    game = FinopolyEngine(seed=0)
+    seller, buyer = game.add_player("A"), game.add_player("B")
+    project = game.projects[0]
+    assert game.invest(seller, project)
+    game.current_round = 2
+    assert game.expand_project(seller, project)
+    game.current_round = 3
+    assert game.pivot_project(seller, project)
+    assert project.cash_flow_schedule()[0] == -project.cost
+    assert project.cash_flow_schedule()[1:3] == pytest.approx([project.base_cash_flow - 20, project.base_cash_flow * 1.5 - 15])
+    game.sell_project(seller, project)
+    assert project.adjustments == ()
+
+    game.current_round = 4
+    assert game.invest(buyer, project)
+    expanded = project.base_cash_flow * 1.5 * 1.2
+    # The buyer pays the full cost for the project as it now stands, with no earlier Expand or Pivot charges.
+    assert project.cash_flow_schedule() == pytest.approx([-project.cost] + [expanded] * (project.base_life + 1))
+    fresh = FinopolyEngine(seed=0).projects[0]
+    fresh.annual_cash_flow, fresh.life = expanded, project.base_life + 1
+    assert project.calculate_irr() == pytest.approx(fresh.calculate_irr())
+
+    game.current_round = 5
+    assert game.expand_project(buyer, project)
+    assert project.adjustments == ((1, 1.5, 0, 20),)
+    assert project.cash_flow_schedule()[:3] == pytest.approx([-project.cost, expanded - 20, expanded * 1.5])
+
+
+def test_game_ends_when_everyone_goes_bankrupt_together():
+    game = FinopolyEngine(seed=0)
+    for name in ("A", "B", "C"):
+        player = game.add_player(name)
+        player.debt, player.cash = 100, 0
+    assert [p.name for p in game.handle_end_of_round()] == ["A", "B", "C"]
+    assert game.players == [] and game.game_over
+    assert game.current_round == 2
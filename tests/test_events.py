@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from finopoly.batch import GameBatch
+from finopoly.catalog import shared_catalog
+from finopoly.engine import Player, Project
+from finopoly.events import apply_effect
+
+# (cash, users, owned projects) for the mover before the event.
+STATES = [
+    (100.0, 1.0, ()),
+    (3.0, 0.5, ("AI Fraud Prevention",)),
+    (40.0, 2.0, ("Blockchain Integration",)),
+    (250.0, 0.0, ("Blockchain Integration", "AI Fraud Prevention")),
+]
+
+
+@pytest.mark.parametrize("cash, users, owned", STATES)
+def test_batch_events_match_apply_effect(cash, users, owned):
+    catalog = shared_catalog()
+    events = catalog.events
+    specs = {spec.name: spec for spec in catalog.projects}
+    batch = GameBatch(len(events), num_players=1)
+    batch.cash[0][:] = cash
+    batch.users[0][:] = users
+    for name in owned:
+        column = batch.catalog.project_index(name)
+        batch.owner[:, column] = 0
+        batch.revenue[0] += batch.cash_flow[:, column]
+    games = np.arange(len(events))
+    batch.apply_events(games, 0, games)
+
+    for i, event in enumerate(events):
+        player = Player("A", starting_cash=cash)
+        player.users = users
+        for name in owned:
+            player.add_project(Project(specs[name]), 1)
+        assert player.total_cash_flow == pytest.approx(batch.revenue[0][i])
+        apply_effect(event.impact, player)
+        assert batch.cash[0][i] == pytest.approx(player.cash), event.name
+        assert batch.users[0][i] == pytest.approx(player.users), event.name
+        assert batch.skip_next[0][i] == player.skip_next_turn, event.name
@@ -0,0 +1,55 @@
+import gc
+import threading
+import time
+
+from finopoly.hub import GameHub
+
+
+class Game:
+    def __init__(self, game_id):
+        self.game_id = game_id
+        self.version = 0
+
+
+def test_attached_table_survives_idle_eviction():
+    hub = GameHub(idle_seconds=0)
+    game = Game("a")
+    hub.open(game)
+    session = hub.attach("a")
+    time.sleep(0.01)
+    hub.open(Game("b"))
+    assert hub.get("a") is game
+    assert hub.open(Game("a")) is game # Not restored a second time
+
+    del session
+    gc.collect()
+    time.sleep(0.01)
+    hub.open(Game("c"))
+    assert hub.get("a") is None
+
+
+def test_waiting_table_survives_idle_eviction():
+    hub = GameHub(idle_seconds=0)
+    game = Game("a")
+    hub.open(game)
+    seen = []
+    waiter = threading.Thread(target=lambda: seen.append(hub.wait("a", 0, timeout=5.0)))
+    waiter.start()
+    time.sleep(0.05)
+    hub.open(Game("b"))
+    hub.publish("a", 1)
+    waiter.join()
+    assert seen == [1]
+    assert hub.get("a") is game
+
+
+def test_use_keeps_table_fresh():
+    hub = GameHub(idle_seconds=0.3)
+    game = Game("a")
+    hub.open(game)
+    for _ in range(6):
+        time.sleep(0.1)
+        with hub.lock("a"):
+            pass
+        hub.open(Game("b"))
+    assert hub.get("a") is game
@@ -0,0 +1,93 @@
+import os
+import sqlite3
+
+import pytest
+
+from finopoly.persistence import GameStore
+from finopoly.turnlog import TurnLog
+
+
+def checkpoint(*names):
+    log = TurnLog(names=names)
+    log.record_roll(3)
+    log.end_turn()
+    return log
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = GameStore(os.path.join(tmp_path, "test.sqlite3"), flush_interval=0.01)
+    yield store
+    store.close()
+
+
+def test_failed_batch_is_requeued_and_retried(store, monkeypatch):
+    write = store._write
+    calls = []
+
+    def flaky(batch):
+        calls.append(sorted(batch))
+        if len(calls) == 1:
+            raise OSError("disk full")
+        write(batch)
+
+    monkeypatch.setattr(store, "_write", flaky)
+    with store.write_lock: # Hold the writer back until the save is queued
+        store.save("a", checkpoint("Ann"))
+    for _ in range(200):
+        if store.writes:
+            break
+        store.wake.set()
+        store.writer.join(0.01)
+    assert store.writer.is_alive()
+    assert calls[:2] == [["a"], ["a"]]
+    assert store.load("a").names == ["Ann"]
+    assert store.close() == []
+
+
+def test_newer_checkpoint_wins_over_requeued_batch(store, monkeypatch):
+    store.close() # Drive flush by hand
+    def failing(batch):
+        store.save("a", checkpoint("Newer"))
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "_write", failing)
+    store.save("a", checkpoint("Older"))
+    with pytest.raises(OSError):
+        store.flush()
+    assert store.load("a").names == ["Newer"]
+
+
+class BrokenConnection:
+    # Fails the write, then fails the rollback too.
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql, *args):
+        if sql == "ROLLBACK":
+            raise sqlite3.OperationalError("cannot rollback - no transaction is active")
+        return self.connection.execute(sql, *args)
+
+    def executemany(self, sql, rows):
+        raise sqlite3.OperationalError("disk I/O error")
+
+
+def test_failed_rollback_keeps_original_error_and_requeues(store, monkeypatch):
+    store.close() # Drive flush by hand
+    acquire, release = store.pool.acquire, store.pool.release
+    monkeypatch.setattr(store.pool, "acquire", lambda: BrokenConnection(acquire()))
+    monkeypatch.setattr(store.pool, "release", lambda connection: release(connection.connection))
+    store.save("a", checkpoint("Ann"))
+    with pytest.raises(sqlite3.OperationalError, match="disk I/O error"):
+        store.flush()
+    assert sorted(store.pending) == ["a"]
+
+
+def test_close_reports_unwritten_checkpoints(store, monkeypatch):
+    def failing(batch):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "_write", failing)
+    store.save("b", checkpoint("Bo"))
+    store.save("a", checkpoint("Ann"))
+    assert store.close() == ["a", "b"]
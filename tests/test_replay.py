@@ -0,0 +1,37 @@
+import pytest
+
+from finopoly.engine import FinopolyEngine, RandomPolicy
+from finopoly.replay import Replay, replay, snapshot
+from finopoly.turnlog import TurnLog
+
+NAMES = ("Ann", "Bo", "Ünïcödé " * 40, "D" * 300) # The last two are over 255 bytes of UTF-8
+
+
+def played(seed):
+    game = FinopolyEngine(seed=seed, default_policy=RandomPolicy())
+    for name in NAMES:
+        game.add_player(name)
+    states = [snapshot(game)]
+    while not game.game_over:
+        game.take_turn()
+        states.append(snapshot(game))
+    return game, states
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_replay_round_trip(seed):
+    game, states = played(seed)
+    raw = game.log.to_bytes()
+    assert TurnLog.from_bytes(raw).to_bytes() == raw
+    replayed = replay(raw)
+    assert [p.name for p in replayed.seats] == list(NAMES)
+    assert snapshot(replayed) == states[-1]
+    assert [(p.name, s) for p, s, *_ in replayed.final_scores()] == [(p.name, s) for p, s, *_ in game.final_scores()]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_state_at_every_turn(seed):
+    game, states = played(seed)
+    history = Replay(game.log.to_bytes())
+    for turn in reversed(range(len(states))): # Backwards, so earlier snapshots are reused
+        assert snapshot(history.state_at(turn)) == states[turn]
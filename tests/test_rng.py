@@ -0,0 +1,31 @@
+import pytest
+
+from finopoly.rng import RandomStream
+
+
+def draws(stream, n=200):
+    return [stream.random() for _ in range(n)]
+
+
+@pytest.mark.parametrize("seed", [None, 0, 12345, [1, 2, 3]])
+def test_seed_replays_the_stream(seed):
+    stream = RandomStream(seed, stream=3)
+    again = RandomStream(stream.seed, stream=3)
+    assert again.seed == stream.seed
+    assert draws(again) == draws(stream)
+
+
+def test_spawned_children_replay_from_their_seed():
+    parent = RandomStream(7)
+    children = parent.spawn(3)
+    assert parent.seed == (7, ())
+    assert [child.seed for child in children] == [(7, (0,)), (7, (1,)), (7, (2,))]
+    expected = [draws(child) for child in children]
+    assert [draws(RandomStream(child.seed)) for child in children] == expected
+    assert len({tuple(d) for d in expected} | {tuple(draws(RandomStream(7)))}) == 4
+
+
+def test_grandchildren_keep_the_whole_key():
+    grandchild = RandomStream(7).spawn(2)[1].spawn(2)[0]
+    assert grandchild.seed == (7, (1, 0))
+    assert draws(RandomStream(grandchild.seed)) == draws(RandomStream(7).spawn(2)[1].spawn(2)[0])
@@ -0,0 +1,29 @@
+from finopoly.engine import FinopolyEngine, RandomPolicy
+from finopoly.solver import Solver
+
+
+def late_game(seed):
+    # Round 4, so each question solves only the last two rounds.
+    game = FinopolyEngine(seed=seed, default_policy=RandomPolicy())
+    for name in ("A", "B"):
+        game.add_player(name)
+    while game.current_round < 4:
+        game.take_turn()
+    return game
+
+
+def test_bounded_memo_gives_the_same_answers():
+    game = late_game(0)
+    bounded, unbounded = Solver(game, max_states=50), Solver(game)
+    largest, largest_solve = 0, 0
+    for player in game.players:
+        for position in range(len(game.board)):
+            player.position = position
+            assert bounded.best_move(game, player) == unbounded.best_move(game, player)
+            largest = max(largest, len(bounded.values))
+            alone = Solver(game)
+            alone.best_move(game, player)
+            largest_solve = max(largest_solve, len(alone.values))
+    # Emptied before a question, never during one.
+    assert largest <= 50 + largest_solve
+    assert largest < len(unbounded.values)
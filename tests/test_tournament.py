@@ -0,0 +1,17 @@
+import numpy as np
+
+from finopoly.tournament import COLUMNS, ResultWriter, read_results
+
+
+def chunk(games):
+    return {name: np.arange(games, dtype=dtype) if name == "game" else np.zeros(games, dtype) for name, dtype in COLUMNS}
+
+
+def test_unclosed_writer_keeps_appended_rows(tmp_path):
+    writer = ResultWriter(str(tmp_path), ["a", "b"])
+    writer.append(chunk(8))
+    writer.append(chunk(4))
+    # No close(), as after a crash.
+    schema, columns = read_results(str(tmp_path))
+    assert schema["rows"] == 12
+    assert list(columns["game"]) == list(range(8)) + list(range(4))
@@ -0,0 +1,59 @@
+import pytest
+
+from finopoly.turnlog import EVENT, FINANCE, PASS, TurnLog
+
+
+def sample(names, bots=None):
+    log = TurnLog(positions=range(20), names=names, bots=bots)
+    log.record_roll(4)
+    log.record_event(2)
+    log.end_turn()
+    log.record_roll(6)
+    log.record_financing(1, 30)
+    log.end_turn()
+    log.end_turn() # Skipped turn
+    return log
+
+
+@pytest.mark.parametrize("names", [
+    ["Ann", "Bo"],
+    ["é" * 200, "Bo"], # 400 bytes of UTF-8
+    ["x" * 127, "y" * 128, "z" * 20000, ""],
+])
+def test_round_trip(names):
+    log = sample(names)
+    restored = TurnLog.from_bytes(log.to_bytes())
+    assert restored.positions == log.positions
+    assert restored.names == names
+    assert restored.turns() == [(4, EVENT, (2,)), (6, FINANCE, (1, 30)), (0, PASS, ())]
+    assert restored.bots == [False] * len(names)
+    assert restored.to_bytes() == log.to_bytes()
+
+
+def test_bot_flags_round_trip():
+    log = TurnLog(positions=range(20))
+    log.add_player("Ann")
+    log.add_player("Ann (AI)", bot=False) # The name says nothing about the seat
+    log.add_player("Deep Blue", bot=True)
+    restored = TurnLog.from_bytes(log.to_bytes())
+    assert restored.names == ["Ann", "Ann (AI)", "Deep Blue"]
+    assert restored.bots == [False, False, True]
+
+
+def test_reads_version_1():
+    # Version 1 stored each name's length in a single byte.
+    raw = bytes([1, 2, 7, 3, 2]) + bytes([3]) + b"Ann" + bytes([2]) + b"Bo" + bytes([4 | EVENT << 4, 2])
+    log = TurnLog.from_bytes(raw)
+    assert log.positions == (7, 3)
+    assert log.names == ["Ann", "Bo"]
+    assert log.bots == [False, False]
+    assert log.turns() == [(4, EVENT, (2,))]
+
+
+def test_reads_version_2():
+    # Version 2 had varint name lengths and no seat flags.
+    raw = bytes([2, 1, 5, 1]) + bytes([0x80, 0x01]) + b"n" * 128 + bytes([PASS << 4 | 6])
+    log = TurnLog.from_bytes(raw)
+    assert log.names == ["n" * 128]
+    assert log.bots == [False]
+    assert log.turns() == [(6, PASS, ())]